@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Tests for the recorder's frame ring and batched raw frame writer.
+
+These pieces are plain Python/numpy and never call into the camera SDK, so they run
+without a camera (or the SDK's native library) attached.
+"""
+
+import json
+import logging
+import os
+import sys
+import time
+import types
+
+import numpy as np
+
+# Add the repository root and camera SDK to Python path
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")
+sys.path.insert(0, ROOT)
+sys.path.append(os.path.join(ROOT, "camera_sdk"))
+
+try:
+    import mvsdk  # noqa: F401
+except (ImportError, OSError):
+    # libMVSDK.so is not installed on this machine; nothing under test touches the SDK
+    sys.modules["mvsdk"] = types.ModuleType("mvsdk")
+
+from usda_vision_system.camera.recorder import FRAME_ALIGNMENT, _FrameRing, _RawFrameWriter, _RecordingSession, _aligned_empty
+
+
+def test_aligned_empty_is_aligned():
+    """Frame buffers start on a FRAME_ALIGNMENT boundary and have the requested shape"""
+    for shape in [(7,), (3, 5, 3), (480, 640)]:
+        array = _aligned_empty(shape, np.uint16)
+        assert array.shape == shape and array.dtype == np.uint16
+        assert array.ctypes.data % FRAME_ALIGNMENT == 0
+
+
+def test_ring_empty_and_full():
+    """An empty ring has nothing to peek; a full ring has nothing to acquire"""
+    ring = _FrameRing([100, 200, 300])
+    assert ring.peek() is None
+
+    for i in range(3):
+        assert ring.acquire() == (100, 200, 300)[i]
+        ring.publish(("frame", i))
+    assert ring.acquire() is None
+
+    # Draining one slot frees exactly that slot for the producer
+    assert ring.peek() == (0, ("frame", 0))
+    ring.release()
+    assert ring.acquire() == 100
+
+
+def test_ring_wraps_around_in_order():
+    """Frames come out in publish order across many trips around the ring"""
+    ring = _FrameRing([10, 20, 30, 40])
+    received = []
+    for n in range(25):
+        address = ring.acquire()
+        assert address == (10, 20, 30, 40)[n % 4]
+        ring.publish((n,))
+        if n % 3 == 2:
+            # Drain in bursts so head and tail cross the wrap point at different times
+            while (item := ring.peek()) is not None:
+                received.append(item[1][0])
+                ring.release()
+    while (item := ring.peek()) is not None:
+        received.append(item[1][0])
+        ring.release()
+
+    assert received == list(range(25))
+    assert ring.peek() is None
+
+
+def test_ring_wait():
+    """wait() returns at once when a frame is pending and times out when the ring is empty"""
+    ring = _FrameRing([1, 2])
+    start = time.monotonic()
+    ring.wait(0.05)
+    assert time.monotonic() - start >= 0.04
+
+    ring.acquire()
+    ring.publish(("frame",))
+    start = time.monotonic()
+    ring.wait(5.0)
+    assert time.monotonic() - start < 1.0
+
+
+def test_session_defers_release_until_last_thread_is_done():
+    """Releases handed over while threads still use the resources run when the last one finishes"""
+    session = _RecordingSession(users=2, logger=logging.getLogger(__name__))
+    released = []
+
+    assert not session.release_when_idle(lambda: released.append("buffers"))
+    session.done()
+    assert released == []
+
+    session.done()
+    assert released == ["buffers"]
+
+    # Once idle, releases run immediately
+    assert session.release_when_idle(lambda: released.append("writer"))
+    assert released == ["buffers", "writer"]
+
+
+def test_session_release_errors_are_contained():
+    """A failing release does not stop the others from running"""
+    session = _RecordingSession(users=1, logger=logging.getLogger(__name__))
+    released = []
+
+    def broken():
+        raise RuntimeError("free failed")
+
+    session.release_when_idle(broken)
+    session.release_when_idle(lambda: released.append("writer"))
+    session.done()
+    assert released == ["writer"]
+
+
+def frames(count, width=4, height=3):
+    """Distinct BGR frames"""
+    return [np.full((height, width, 3), i + 1, dtype=np.uint8) for i in range(count)]
+
+
+def test_raw_writer_batches_frames(tmp_path):
+    """Frames are staged until the batch is full, then written with one writev()"""
+    output = tmp_path / "recording.raw"
+    writer = _RawFrameWriter(str(output), 30.0, (4, 3), max_batch=3, max_delay=60.0)
+    assert writer.isOpened()
+    frame_bytes = 4 * 3 * 3
+
+    test_frames = frames(5)
+    for frame in test_frames[:2]:
+        writer.write(frame)
+    assert output.stat().st_size == 0
+
+    writer.write(test_frames[2])
+    assert output.stat().st_size == 3 * frame_bytes
+
+    # The remainder is flushed on release
+    for frame in test_frames[3:]:
+        writer.write(frame)
+    writer.release()
+    assert not writer.isOpened()
+
+    data = output.read_bytes()
+    assert data == b"".join(frame.tobytes() for frame in test_frames)
+
+
+def test_raw_writer_copies_frames(tmp_path):
+    """A staged frame is a copy, so the caller may overwrite its buffer before the flush"""
+    output = tmp_path / "recording.raw"
+    writer = _RawFrameWriter(str(output), 30.0, (4, 3), max_batch=4, max_delay=60.0)
+    frame = np.full((3, 4, 3), 9, dtype=np.uint8)
+    writer.write(frame)
+    frame[:] = 0
+    writer.release()
+
+    assert output.read_bytes() == bytes([9]) * (4 * 3 * 3)
+
+
+def test_raw_writer_poll_flushes_stale_frames(tmp_path):
+    """poll() flushes a partial batch once it has waited longer than max_delay"""
+    output = tmp_path / "recording.raw"
+    writer = _RawFrameWriter(str(output), 30.0, (4, 3), max_batch=8, max_delay=0.01)
+    writer.write(frames(1)[0])
+    time.sleep(0.02)
+    writer.poll()
+    assert output.stat().st_size == 4 * 3 * 3
+    writer.release()
+
+
+def test_raw_writer_sidecar(tmp_path):
+    """Frame geometry is written to a JSON sidecar next to the output"""
+    output = tmp_path / "recording.raw"
+    _RawFrameWriter(str(output), 12.5, (4, 3)).release()
+
+    sidecar = json.loads((tmp_path / "recording.raw.json").read_text())
+    assert sidecar == {"width": 4, "height": 3, "channels": 3, "dtype": "uint8", "pixel_format": "bgr24", "fps": 12.5}
+
+
+def test_raw_writer_release_is_idempotent(tmp_path):
+    """Releasing twice does not fail or write anything more"""
+    output = tmp_path / "recording.raw"
+    writer = _RawFrameWriter(str(output), 30.0, (4, 3))
+    writer.write(frames(1)[0])
+    writer.release()
+    writer.release()
+    assert output.stat().st_size == 4 * 3 * 3
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tests for config file parse caching and the memoized Config.to_dict().
+"""
+
+import json
+import os
+import sys
+
+# Add the repository root to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from usda_vision_system.core import config as config_module
+from usda_vision_system.core.config import Config
+
+
+def write_config(path, storage_path, exposure_ms=1.0):
+    """Write a minimal config file with one camera"""
+    data = {
+        "mqtt": {"broker_host": "localhost", "broker_port": 1883, "topics": {"vibratory_conveyor": "vision/vibratory_conveyor/state"}},
+        "storage": {"base_path": str(storage_path)},
+        "cameras": [{"name": "camera1", "machine_topic": "vibratory_conveyor", "storage_path": str(storage_path / "camera1"), "exposure_ms": exposure_ms}],
+    }
+    path.write_text(json.dumps(data))
+
+
+def test_unchanged_file_is_parsed_once(tmp_path):
+    """The parse is reused while the file's mtime and size are unchanged"""
+    config_file = tmp_path / "config.json"
+    write_config(config_file, tmp_path)
+
+    first = config_module._read_config_file(config_file)
+    assert config_module._read_config_file(config_file) is first
+
+
+def test_changed_file_is_parsed_again(tmp_path):
+    """Editing the file on disk invalidates the cached parse"""
+    config_file = tmp_path / "config.json"
+    write_config(config_file, tmp_path, exposure_ms=1.0)
+    first = config_module._read_config_file(config_file)
+
+    write_config(config_file, tmp_path, exposure_ms=12.5)
+    stat = config_file.stat()
+    os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    second = config_module._read_config_file(config_file)
+    assert second is not first
+    assert second["cameras"][0]["exposure_ms"] == 12.5
+
+
+def test_to_dict_is_memoized(tmp_path):
+    """Repeated to_dict() calls return the same dict until something changes"""
+    config_file = tmp_path / "config.json"
+    write_config(config_file, tmp_path)
+    config = Config(str(config_file))
+
+    result = config.to_dict()
+    assert config.to_dict() is result
+    assert result["cameras"][0]["name"] == "camera1"
+    assert result["mqtt"]["broker_host"] == "localhost"
+
+
+def test_update_camera_config_invalidates_to_dict(tmp_path):
+    """Camera updates show up in to_dict() and are written back to the file"""
+    config_file = tmp_path / "config.json"
+    write_config(config_file, tmp_path)
+    config = Config(str(config_file))
+    before = config.to_dict()
+
+    assert config.update_camera_config("camera1", exposure_ms=4.0)
+    after = config.to_dict()
+    assert after is not before
+    assert after["cameras"][0]["exposure_ms"] == 4.0
+    # The sections that did not change are not rebuilt
+    assert after["mqtt"] is before["mqtt"]
+
+    assert json.loads(config_file.read_text())["cameras"][0]["exposure_ms"] == 4.0
+
+
+def test_reload_picks_up_saved_changes(tmp_path):
+    """Saving drops the cached parse, so a fresh load sees the saved values"""
+    config_file = tmp_path / "config.json"
+    write_config(config_file, tmp_path)
+    config = Config(str(config_file))
+    config.to_dict()
+
+    config.get_camera_by_name("camera1").gain = 2.0
+    config.save_config()
+
+    reloaded = Config(str(config_file))
+    assert reloaded.get_camera_by_name("camera1").gain == 2.0
+    assert reloaded.to_dict()["cameras"][0]["gain"] == 2.0
+
+
+def test_load_config_invalidates_to_dict(tmp_path):
+    """load_config() replaces the sections, so to_dict() is rebuilt from them"""
+    config_file = tmp_path / "config.json"
+    write_config(config_file, tmp_path, exposure_ms=1.0)
+    config = Config(str(config_file))
+    before = config.to_dict()
+
+    write_config(config_file, tmp_path, exposure_ms=9.0)
+    stat = config_file.stat()
+    os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    config.load_config()
+
+    after = config.to_dict()
+    assert after is not before
+    assert after["cameras"][0]["exposure_ms"] == 9.0
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Tests for the frame bus that shares recorder frames with the live preview streamer.
+"""
+
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+# Add the repository root to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from usda_vision_system.core.frame_bus import FrameBus
+
+
+def test_attach_and_detach_are_counted():
+    """A camera keeps its producer until every attached producer has detached"""
+    bus = FrameBus()
+    assert not bus.has_producer("camera1")
+
+    bus.attach_producer("camera1")
+    bus.attach_producer("camera1")
+    bus.detach_producer("camera1")
+    assert bus.has_producer("camera1")
+
+    bus.detach_producer("camera1")
+    assert not bus.has_producer("camera1")
+
+
+def test_publish_without_consumer_is_dropped():
+    """Frames published while nobody is subscribed are not kept"""
+    bus = FrameBus()
+    bus.attach_producer("camera1")
+    assert not bus.frame_due("camera1")
+
+    bus.publish("camera1", np.zeros((2, 2), dtype=np.uint8))
+    assert bus.wait_for_frame("camera1", -1, 0.01) is None
+
+
+def test_published_frame_is_a_copy():
+    """Consumers get a copy, so the producer can reuse its buffer right away"""
+    bus = FrameBus()
+    bus.attach_producer("camera1")
+    bus.subscribe("camera1", max_fps=1000)
+    assert bus.frame_due("camera1")
+
+    frame = np.full((2, 2), 7, dtype=np.uint8)
+    bus.publish("camera1", frame)
+    frame[:] = 0
+
+    seq, received = bus.wait_for_frame("camera1", -1, 1.0)
+    assert received is not frame
+    assert (received == 7).all()
+
+    # Nothing newer than what we already have
+    assert bus.wait_for_frame("camera1", seq, 0.01) is None
+
+
+def test_frame_due_honors_the_fastest_consumer():
+    """After a publish, the next frame is not due until the shortest requested interval passes"""
+    bus = FrameBus()
+    bus.attach_producer("camera1")
+    bus.subscribe("camera1", max_fps=1)
+    bus.subscribe("camera1", max_fps=20)
+
+    bus.publish("camera1", np.zeros((1, 1), dtype=np.uint8))
+    assert not bus.frame_due("camera1")
+    time.sleep(0.06)
+    assert bus.frame_due("camera1")
+
+    # The interval goes away with the last consumer
+    bus.unsubscribe("camera1")
+    bus.unsubscribe("camera1")
+    assert not bus.frame_due("camera1")
+
+
+def test_frames_fan_out_to_every_consumer():
+    """Every waiting consumer wakes up with the same published frame"""
+    bus = FrameBus()
+    bus.attach_producer("camera1")
+    results = []
+
+    def consume():
+        bus.subscribe("camera1", max_fps=1000)
+        try:
+            results.append(bus.wait_for_frame("camera1", -1, 2.0))
+        finally:
+            bus.unsubscribe("camera1")
+
+    consumers = [threading.Thread(target=consume) for _ in range(3)]
+    for consumer in consumers:
+        consumer.start()
+    time.sleep(0.05)
+    bus.publish("camera1", np.ones((2, 2), dtype=np.uint8))
+    for consumer in consumers:
+        consumer.join(2.0)
+
+    assert len(results) == 3
+    assert len({entry[0] for entry in results}) == 1
+
+
+def test_detach_wakes_waiting_consumer():
+    """A consumer waiting for frames returns as soon as the producer goes away"""
+    bus = FrameBus()
+    bus.attach_producer("camera1")
+    bus.subscribe("camera1", max_fps=10)
+
+    threading.Timer(0.05, bus.detach_producer, args=("camera1",)).start()
+    start = time.monotonic()
+    assert bus.wait_for_frame("camera1", -1, 5.0) is None
+    assert time.monotonic() - start < 1.0
+    assert not bus.has_producer("camera1")
+
+
+def test_sequences_never_repeat_across_producer_sessions():
+    """A new producer session never reuses a sequence number a consumer may still hold"""
+    bus = FrameBus()
+    bus.subscribe("camera1", max_fps=1000)
+
+    bus.attach_producer("camera1")
+    bus.publish("camera1", np.zeros((1, 1), dtype=np.uint8))
+    first_seq, _ = bus.wait_for_frame("camera1", -1, 1.0)
+    bus.detach_producer("camera1")
+
+    bus.attach_producer("camera1")
+    bus.publish("camera1", np.zeros((1, 1), dtype=np.uint8))
+    entry = bus.wait_for_frame("camera1", first_seq, 1.0)
+    assert entry is not None and entry[0] != first_seq
+
+
+def test_session_refused_while_producer_owns_camera():
+    """A consumer cannot open its own camera session once a producer has attached"""
+    bus = FrameBus()
+    assert bus.open_session("camera1")
+    bus.close_session("camera1")
+
+    bus.attach_producer("camera1")
+    assert not bus.open_session("camera1")
+    bus.detach_producer("camera1")
+    assert bus.open_session("camera1")
+
+
+def test_producer_waits_for_sessions_to_close():
+    """wait_for_sessions_closed() returns once the last consumer session is released"""
+    bus = FrameBus()
+    assert bus.wait_for_sessions_closed("camera1", 0.01)
+
+    bus.open_session("camera1")
+    bus.attach_producer("camera1")
+    assert not bus.wait_for_sessions_closed("camera1", 0.01)
+
+    closer = threading.Timer(0.05, bus.close_session, args=("camera1",))
+    closer.start()
+    start = time.monotonic()
+    assert bus.wait_for_sessions_closed("camera1", 5.0)
+    assert time.monotonic() - start < 1.0
+    closer.join()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Tests for the SNTP request/response handling used by the time synchronization check.
+"""
+
+import os
+import struct
+import sys
+import time
+
+import pytest
+
+# Add the repository root to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from usda_vision_system.core import timezone_utils
+
+
+def ntp_timestamp(seconds: float) -> bytes:
+    """Encode Unix seconds as a 64-bit NTP timestamp (32.32 fixed point since 1900)"""
+    whole = int(seconds)
+    return struct.pack("!II", whole + timezone_utils._NTP_EPOCH_OFFSET, int((seconds - whole) * 2**32))
+
+
+class FakeSocket:
+    """Stands in for the UDP socket and answers with a canned NTP response"""
+
+    response = b""
+    sent = []
+
+    def __init__(self, *args):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def settimeout(self, timeout):
+        pass
+
+    def sendto(self, data, address):
+        FakeSocket.sent.append((data, address))
+
+    def recvfrom(self, size):
+        return FakeSocket.response[:size], ("127.0.0.1", 123)
+
+
+@pytest.fixture
+def fake_socket(monkeypatch):
+    FakeSocket.sent = []
+    monkeypatch.setattr(timezone_utils.socket, "socket", FakeSocket)
+    return FakeSocket
+
+
+def server_response(server_time: float) -> bytes:
+    """Build a 48-byte server reply whose receive and transmit timestamps are server_time"""
+    return b"\x1c" + 31 * b"\0" + ntp_timestamp(server_time) + ntp_timestamp(server_time)
+
+
+def test_request_is_an_sntp_client_packet(fake_socket):
+    """The request is 48 bytes with LI=0, VN=3, Mode=3, sent to port 123"""
+    fake_socket.response = server_response(time.time())
+    timezone_utils._query_ntp("ntp.example")
+
+    data, address = fake_socket.sent[0]
+    assert len(data) == 48 and data[0] == 0x1B
+    assert address == ("ntp.example", 123)
+
+
+def test_offset_and_server_time_are_parsed(fake_socket):
+    """A server 100 s ahead of us yields a ~100 s offset and its transmit time"""
+    server_time = time.time() + 100.25
+    fake_socket.response = server_response(server_time)
+
+    offset, parsed_time = timezone_utils._query_ntp()
+    assert offset == pytest.approx(100.25, abs=0.5)
+    assert parsed_time == pytest.approx(server_time, abs=1e-3)
+
+
+def test_short_response_is_rejected(fake_socket):
+    """A truncated reply raises instead of being parsed as garbage"""
+    fake_socket.response = b"\x1c" * 20
+    with pytest.raises(ValueError):
+        timezone_utils._query_ntp()
+
+
+@pytest.mark.parametrize("offset, status", [(0.5, "synchronized"), (-12.0, "minor_drift"), (90.0, "out_of_sync")])
+def test_check_time_sync_classifies_offset(monkeypatch, offset, status):
+    """check_time_sync() grades the absolute clock offset"""
+    monkeypatch.setattr(timezone_utils, "_query_ntp", lambda: (offset, time.time() + offset))
+    result = timezone_utils.check_time_sync()
+    assert result["sync_status"] == status
+    assert result["time_diff_seconds"] == abs(offset)
+    assert result["error"] is None
+
+
+def test_check_time_sync_reports_errors(monkeypatch):
+    """Network failures are reported rather than raised"""
+
+    def unreachable():
+        raise OSError("network unreachable")
+
+    monkeypatch.setattr(timezone_utils, "_query_ntp", unreachable)
+    result = timezone_utils.check_time_sync()
+    assert result["sync_status"] == "unknown"
+    assert "unreachable" in result["error"]
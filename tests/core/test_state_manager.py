@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Tests for the state manager's copy-on-write snapshots and bulk machine updates.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add the repository root to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from usda_vision_system.core.state_manager import StateManager, MachineState
+
+
+def test_machine_snapshot_is_read_only():
+    """get_all_machines() returns a view callers cannot mutate"""
+    manager = StateManager()
+    manager.update_machine_state("vibratory_conveyor", "on")
+
+    machines = manager.get_all_machines()
+    with pytest.raises(TypeError):
+        machines["blower_separator"] = None
+
+
+def test_machine_snapshot_is_not_affected_by_new_machines():
+    """Adding a machine replaces the dict, so snapshots handed out earlier stay unchanged"""
+    manager = StateManager()
+    manager.update_machine_state("vibratory_conveyor", "on")
+    before = manager.get_all_machines()
+
+    manager.update_machine_state("blower_separator", "off")
+    after = manager.get_all_machines()
+
+    assert set(before) == {"vibratory_conveyor"}
+    assert set(after) == {"vibratory_conveyor", "blower_separator"}
+
+
+def test_update_machine_state_reports_changes():
+    """Only a different state counts as a change; unknown states fall back to UNKNOWN"""
+    manager = StateManager()
+    assert manager.update_machine_state("vibratory_conveyor", "on")
+    assert not manager.update_machine_state("vibratory_conveyor", "ON")
+    assert manager.update_machine_state("vibratory_conveyor", "bogus")
+    assert manager.get_machine_state("vibratory_conveyor").state is MachineState.UNKNOWN
+
+
+def test_bulk_update_applies_in_order():
+    """Bulk updates are applied in arrival order and report each message's change"""
+    manager = StateManager()
+    updates = [
+        ("vibratory_conveyor", "on", "on", "vision/vibratory_conveyor/state"),
+        ("vibratory_conveyor", "on", "1", "vision/vibratory_conveyor/state"),
+        ("blower_separator", "off", "off", "vision/blower_separator/state"),
+        ("vibratory_conveyor", "off", "off", "vision/vibratory_conveyor/state"),
+    ]
+
+    assert manager.update_machine_state_bulk(updates) == [True, False, True, True]
+
+    conveyor = manager.get_machine_state("vibratory_conveyor")
+    assert conveyor.state is MachineState.OFF
+    assert conveyor.last_message == "off"
+    assert conveyor.mqtt_topic == "vision/vibratory_conveyor/state"
+    assert manager.get_machine_state("blower_separator").state is MachineState.OFF
+
+
+def test_bulk_mqtt_events_are_numbered_and_capped():
+    """Bulk events keep a running message number and the history keeps only the newest ones"""
+    manager = StateManager()
+    manager.add_mqtt_event("vibratory_conveyor", "t", "on", "on")
+    manager.add_mqtt_events_bulk([("vibratory_conveyor", "t", str(i), "on") for i in range(150)])
+
+    assert manager.get_mqtt_event_count() == 151
+    recent = manager.get_recent_mqtt_events(3)
+    assert [event.message_number for event in recent] == [151, 150, 149]
+    assert recent[0].payload == "149"
+
+    # Only the newest 100 events are kept
+    assert len(manager.get_recent_mqtt_events(1000)) == 100
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Tests for batched MQTT message handling in MQTTMessageHandler.
+"""
+
+import os
+import sys
+import threading
+
+# Add the repository root to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from usda_vision_system.core import events
+from usda_vision_system.core.events import EventSystem, EventType
+from usda_vision_system.core.state_manager import StateManager, MachineState
+from usda_vision_system.mqtt.handlers import MQTTMessageHandler
+
+CONVEYOR = ("vibratory_conveyor", "vision/vibratory_conveyor/state")
+BLOWER = ("blower_separator", "vision/blower_separator/state")
+
+
+def make_handler():
+    state_manager = StateManager()
+    return MQTTMessageHandler(state_manager, EventSystem()), state_manager
+
+
+def collect_state_changes():
+    """Record the machine state change events published on the global event system"""
+    received = []
+
+    def on_change(event):
+        received.append((event.data["machine_name"], event.data["state"]))
+
+    events.event_system.subscribe(EventType.MACHINE_STATE_CHANGED, on_change)
+    return received, on_change
+
+
+def test_batch_is_applied_in_order():
+    """A batch updates states, history and change events in arrival order"""
+    handler, state_manager = make_handler()
+    received, callback = collect_state_changes()
+    try:
+        handler.handle_messages([(*CONVEYOR, "on"), (*BLOWER, "running"), (*CONVEYOR, "1"), (*CONVEYOR, " OFF ")])
+    finally:
+        events.event_system.unsubscribe(EventType.MACHINE_STATE_CHANGED, callback)
+
+    assert received == [("vibratory_conveyor", "on"), ("blower_separator", "on"), ("vibratory_conveyor", "off")]
+    assert state_manager.get_machine_state("vibratory_conveyor").state is MachineState.OFF
+    assert state_manager.get_machine_state("blower_separator").state is MachineState.ON
+    assert [event.payload for event in state_manager.get_recent_mqtt_events(4)] == [" OFF ", "1", "running", "on"]
+
+    stats = handler.get_statistics()
+    assert stats["total_messages"] == 4 and stats["error_count"] == 0
+    assert stats["last_message_time"] is not None
+
+
+def test_bad_message_does_not_drop_the_batch():
+    """A malformed payload is counted as one error; the other machines are still updated"""
+    handler, state_manager = make_handler()
+    handler.handle_messages([(*CONVEYOR, "on"), (*BLOWER, None), ("dryer", "vision/dryer/state", "off")])
+
+    assert handler.error_count == 1
+    assert handler.message_count == 3
+    assert state_manager.get_machine_state("vibratory_conveyor").state is MachineState.ON
+    assert state_manager.get_machine_state("dryer").state is MachineState.OFF
+    assert state_manager.get_machine_state("blower_separator") is None
+
+
+def test_failed_bulk_update_falls_back_to_single_updates():
+    """If the bulk state update fails, every message is still applied one at a time"""
+    handler, state_manager = make_handler()
+
+    def broken_bulk(updates):
+        raise RuntimeError("bulk update unavailable")
+
+    handler._update_machine_state_bulk = broken_bulk
+    handler.handle_messages([(*CONVEYOR, "on"), (*BLOWER, "off")])
+
+    assert handler.error_count == 0
+    assert state_manager.get_machine_state("vibratory_conveyor").state is MachineState.ON
+    assert state_manager.get_machine_state("blower_separator").state is MachineState.OFF
+
+
+def test_handle_message_uses_the_batch_path():
+    """handle_message() processes a single message immediately"""
+    handler, state_manager = make_handler()
+    handler.handle_message(*CONVEYOR, "active")
+
+    assert state_manager.get_machine_state("vibratory_conveyor").state is MachineState.ON
+    assert handler.message_count == 1
+
+
+def test_drain_thread_processes_everything_before_stopping():
+    """Messages submitted from another thread are all processed by the time stop() returns"""
+    handler, state_manager = make_handler()
+    handler.start()
+
+    def produce():
+        for i in range(500):
+            handler.submit_message(*CONVEYOR, "on" if i % 2 else "off")
+
+    producer = threading.Thread(target=produce)
+    producer.start()
+    producer.join()
+    handler.stop()
+
+    assert handler.message_count == 500
+    assert state_manager.get_mqtt_event_count() == 500
+    # The last message sent was "on"
+    assert state_manager.get_machine_state("vibratory_conveyor").state is MachineState.ON
+
+
+def test_handler_can_be_restarted():
+    """stop() followed by start() resumes processing"""
+    handler, state_manager = make_handler()
+    handler.start()
+    handler.stop()
+    handler.start()
+    handler.submit_message(*BLOWER, "on")
+    handler.stop()
+
+    assert state_manager.get_machine_state("blower_separator").state is MachineState.ON
@@ -153,7 +153,7 @@ class APIServer:
             """Get all machine statuses"""
             try:
                 machines = self.state_manager.get_all_machines()
-                return {name: MachineStatusResponse(name=machine.name, state=machine.state.value, last_updated=machine.last_updated.isoformat(), last_message=machine.last_message, mqtt_topic=machine.mqtt_topic) for name, machine in machines.items()}
+                return {name: MachineStatusResponse(name=machine.name, state=machine.state.value, last_updated=machine.last_updated_iso, last_message=machine.last_message, mqtt_topic=machine.mqtt_topic) for name, machine in machines.items()}
             except Exception as e:
                 self.logger.error(f"Error getting machines: {e}")
                 raise HTTPException(status_code=500, detail=str(e))
@@ -195,7 +195,7 @@ class APIServer:
                         name=camera.name,
                         status=camera.status.value,
                         is_recording=camera.is_recording,
-                        last_checked=camera.last_checked.isoformat(),
+                        last_checked=camera.last_checked_iso,
                         last_error=camera.last_error,
                         device_info=camera.device_info,
                         current_recording_file=camera.current_recording_file,
@@ -220,7 +220,7 @@ class APIServer:
                 if not camera:
                     raise HTTPException(status_code=404, detail=f"Camera not found: {camera_name}")
 
-                return CameraStatusResponse(name=camera.name, status=camera.status.value, is_recording=camera.is_recording, last_checked=camera.last_checked.isoformat(), last_error=camera.last_error, device_info=camera.device_info, current_recording_file=camera.current_recording_file, recording_start_time=camera.recording_start_time.isoformat() if camera.recording_start_time else None)
+                return CameraStatusResponse(name=camera.name, status=camera.status.value, is_recording=camera.is_recording, last_checked=camera.last_checked_iso, last_error=camera.last_error, device_info=camera.device_info, current_recording_file=camera.current_recording_file, recording_start_time=camera.recording_start_time.isoformat() if camera.recording_start_time else None)
             except HTTPException:
                 raise
             except Exception as e:
@@ -287,7 +287,7 @@ class APIServer:
                 raise HTTPException(status_code=500, detail=str(e))
 
         @self.app.get("/cameras/{camera_name}/stream")
-        async def camera_stream(camera_name: str):
+        async def camera_stream(camera_name: str, raw: bool = Query(default=False, description="Stream uncompressed PPM/PGM frames instead of JPEG (for same-host viewers)")):
             """Get live MJPEG stream from camera"""
             try:
                 if not self.camera_manager:
@@ -304,6 +304,9 @@ class APIServer:
                     if not success:
                         raise HTTPException(status_code=500, detail=f"Failed to start streaming for camera {camera_name}")
 
+                if raw:
+                    return StreamingResponse(streamer.get_raw_frame_generator(), media_type="multipart/x-mixed-replace; boundary=frame")
+
                 # Return MJPEG stream
                 return StreamingResponse(streamer.get_frame_generator(), media_type="multipart/x-mixed-replace; boundary=frame")
 
@@ -694,7 +697,7 @@ class APIServer:
         def broadcast_event(event: Event):
             """Broadcast event to all WebSocket connections"""
             try:
-                message = {"type": "event", "event_type": event.event_type.value, "source": event.source, "data": event.data, "timestamp": event.timestamp.isoformat()}
+                message = {"type": "event", "event_type": event.event_type.value, "source": event.source, "data": dict(event.data), "timestamp": event.timestamp.isoformat()}
 
                 # Schedule the broadcast in the event loop thread-safely
                 if self._event_loop and not self._event_loop.is_closed():
@@ -20,6 +20,7 @@ from ..core.config import Config, CameraConfig
 from ..core.state_manager import StateManager, CameraStatus
 from ..core.events import EventSystem, EventType, Event, publish_camera_status_changed
 from ..core.timezone_utils import format_filename_timestamp
+from ..core.frame_bus import FrameBus
 from .recorder import CameraRecorder
 from .monitor import CameraMonitor
 from .streamer import CameraStreamer
@@ -43,6 +44,7 @@ class CameraManager:
         self.camera_recorders: Dict[str, CameraRecorder] = {}  # camera_name -> recorder
         self.camera_streamers: Dict[str, CameraStreamer] = {}  # camera_name -> streamer
         self.camera_monitor: Optional[CameraMonitor] = None
+        self.frame_bus = FrameBus()  # Lets streamers preview frames from recorders that own the camera
 
         # Threading
         self._lock = threading.RLock()
@@ -153,7 +155,7 @@ class CameraManager:
                         continue
 
                     # Create recorder (uses lazy initialization - camera will be initialized when recording starts)
-                    recorder = CameraRecorder(camera_config=camera_config, device_info=device_info, state_manager=self.state_manager, event_system=self.event_system)
+                    recorder = CameraRecorder(camera_config=camera_config, device_info=device_info, state_manager=self.state_manager, event_system=self.event_system, frame_bus=self.frame_bus)
 
                     # Add recorder to the list (camera will be initialized lazily when needed)
                     self.camera_recorders[camera_config.name] = recorder
@@ -430,7 +432,7 @@ class CameraManager:
                     return False
 
                 # Create new recorder (uses lazy initialization)
-                recorder = CameraRecorder(camera_config=camera_config, device_info=device_info, state_manager=self.state_manager, event_system=self.event_system)
+                recorder = CameraRecorder(camera_config=camera_config, device_info=device_info, state_manager=self.state_manager, event_system=self.event_system, frame_bus=self.frame_bus)
 
                 # Success - add to recorders (camera will be initialized lazily when needed)
                 self.camera_recorders[camera_name] = recorder
@@ -459,7 +461,7 @@ class CameraManager:
                         continue
 
                     # Create streamer
-                    streamer = CameraStreamer(camera_config=camera_config, device_info=device_info, state_manager=self.state_manager, event_system=self.event_system)
+                    streamer = CameraStreamer(camera_config=camera_config, device_info=device_info, state_manager=self.state_manager, event_system=self.event_system, frame_bus=self.frame_bus)
 
                     # Add streamer to the list
                     self.camera_streamers[camera_config.name] = streamer
@@ -11,11 +11,17 @@ import time
 import logging
 import cv2
 import numpy as np
-import contextlib
-from typing import Optional, Dict, Any
+import functools
+import json
+from typing import Optional, Dict, Any, List, Callable
 from datetime import datetime
 from pathlib import Path
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the numpy/OpenCV path is used without it
+    njit = None
+
 # Add camera SDK to path
 sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", "camera_sdk"))
 import mvsdk
@@ -24,60 +30,279 @@ from ..core.config import CameraConfig
 from ..core.state_manager import StateManager
 from ..core.events import EventSystem, publish_recording_started, publish_recording_stopped, publish_recording_error
 from ..core.timezone_utils import now_atlanta, format_filename_timestamp
-from .sdk_config import ensure_sdk_initialized
+from ..core.frame_bus import FrameBus
+from .sdk_config import ensure_sdk_initialized, suppress_camera_errors
+
+# H.264 encoders for the GStreamer writer, tried in order (GPU/VPU first, threaded x264 last)
+GSTREAMER_ENCODERS = (
+    "nvh264enc preset=low-latency-hp",
+    "vaapih264enc",
+    "x264enc threads=4 tune=zerolatency speed-preset=ultrafast",
+)
+
+# Encoder that last opened successfully, so later recordings skip the failing probes
+_gstreamer_encoder: Optional[str] = None
+
+
+if njit is not None:
+
+    # The explicit signature compiles the kernel when this module is imported (or loads it from the
+    # on-disk cache) instead of on the first frame in the writer thread, where the stall would overflow
+    # the ring. It runs serially: each recorder's writer thread is already the unit of parallelism,
+    # and a numba thread pool would fight the per-camera core pinning.
+    @njit("void(uint16[:, :], uint8[:, :, :], int64)", fastmath=True, cache=True)
+    def _mono16_to_bgr8(src, dst, shift):
+        """Scale a 10/12/16-bit mono frame to 8 bits and replicate it into 3 BGR planes in one pass"""
+        for i in range(src.shape[0]):
+            for j in range(src.shape[1]):
+                v = src[i, j] >> shift
+                dst[i, j, 0] = v
+                dst[i, j, 1] = v
+                dst[i, j, 2] = v
+
+else:
+    _mono16_to_bgr8 = None
+
+
+@functools.lru_cache(maxsize=1)
+def gstreamer_available() -> bool:
+    """Check whether OpenCV was built with GStreamer support"""
+    for line in cv2.getBuildInformation().splitlines():
+        if line.strip().startswith("GStreamer:"):
+            return "YES" in line
+    return False
+
+
+# Alignment for frame buffers (one cache line; also satisfies AVX2/AVX-512 aligned loads)
+FRAME_ALIGNMENT = 64
+
+
+def _aligned_empty(shape, dtype=np.uint8, align: int = FRAME_ALIGNMENT) -> np.ndarray:
+    """Allocate an uninitialized array whose data pointer is aligned to `align` bytes"""
+    dtype = np.dtype(dtype)
+    nbytes = int(np.prod(shape)) * dtype.itemsize
+    buf = np.empty(nbytes + align, dtype=np.uint8)
+    offset = (-buf.ctypes.data) % align
+    return buf[offset : offset + nbytes].view(dtype).reshape(shape)
+
+
+class _FrameRing:
+    """Single-producer/single-consumer ring over the recorder's SDK frame buffers.
+
+    The producer hands the address of a free slot straight to the ISP, so processed
+    frames land in the slot the writer reads from without an intermediate copy.
+    The capture thread is the only writer of ``_head`` and the writer thread the
+    only writer of ``_tail``, so no lock is needed around the indices.
+    """
+
+    def __init__(self, addresses: List[int]):
+        self._addresses = addresses
+        self._meta: list = [None] * len(addresses)
+        self._size = len(addresses)
+        self._head = 0  # Next slot to fill (producer-owned)
+        self._tail = 0  # Next slot to drain (consumer-owned)
+        self._ready = threading.Event()
+
+    def acquire(self) -> Optional[int]:
+        """Get the buffer address of the next free slot for the producer, or None if the ring is full"""
+        if self._head - self._tail >= self._size:
+            return None
+        return self._addresses[self._head % self._size]
+
+    def publish(self, meta: tuple) -> None:
+        """Publish the slot returned by acquire() along with its frame metadata"""
+        self._meta[self._head % self._size] = meta
+        self._head += 1
+        self._ready.set()
+
+    def peek(self) -> Optional[tuple]:
+        """Get the oldest published (slot index, meta) pair for the consumer, or None if empty"""
+        if self._tail == self._head:
+            return None
+        index = self._tail % self._size
+        return index, self._meta[index]
+
+    def release(self) -> None:
+        """Return the slot from peek() to the producer"""
+        self._tail += 1
+
+    def wait(self, timeout: float) -> None:
+        """Block the consumer until a frame is published or the timeout expires"""
+        self._ready.clear()
+        if self._tail == self._head:
+            self._ready.wait(timeout)
+
+
+class _RecordingSession:
+    """Resources shared by one recording's capture and writer threads.
+
+    Joins on these threads are bounded, so either may still be running when the recorder
+    gives up waiting (a writer stuck in the encoder, a capture stuck in the SDK). Releases
+    of the ring buffers and video writer are then handed to the session instead of freeing
+    memory that is still in use, and run by the last thread to finish.
+    """
+
+    def __init__(self, users: int, logger: logging.Logger):
+        self.capture_done = threading.Event()
+        self._users = users
+        self._releases: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+        self._logger = logger
+
+    def release_when_idle(self, release: Callable[[], None]) -> bool:
+        """Run release now if no thread uses the resources any more, otherwise when the last one finishes"""
+        with self._lock:
+            if self._users:
+                self._releases.append(release)
+                return False
+        self._run(release)
+        return True
+
+    def done(self) -> None:
+        """Called by each thread once it no longer touches the ring buffers or video writer"""
+        with self._lock:
+            self._users -= 1
+            if self._users:
+                return
+            releases, self._releases = self._releases, []
+        for release in releases:
+            self._run(release)
+
+    def _run(self, release: Callable[[], None]) -> None:
+        try:
+            release()
+        except Exception as e:
+            self._logger.error(f"Error releasing recording resources: {e}")
 
 
-@contextlib.contextmanager
-def suppress_camera_errors():
-    """Context manager to temporarily suppress camera SDK error output"""
-    # Save original file descriptors
-    original_stderr = os.dup(2)
-    original_stdout = os.dup(1)
+def _shaped_view_cache(buffers: List[np.ndarray], channels: int):
+    """Build a lookup returning a cached (height, width[, channels]) view over each buffer
 
-    try:
-        # Redirect stderr and stdout to devnull
-        devnull = os.open(os.devnull, os.O_WRONLY)
-        os.dup2(devnull, 2)  # stderr
-        os.dup2(devnull, 1)  # stdout (in case SDK uses stdout)
-        os.close(devnull)
+    Views are only rebuilt when the frame size changes, so steady-state lookups create no
+    new array objects.
+    """
+    cached: list = [None] * len(buffers)
 
-        yield
+    def shaped_view(index: int, width: int, height: int) -> np.ndarray:
+        entry = cached[index]
+        if entry is None or entry[0] != width or entry[1] != height:
+            shape = (height, width, channels) if channels > 1 else (height, width)
+            entry = cached[index] = (width, height, buffers[index][: width * height * channels].reshape(shape))
+        return entry[2]
 
-    finally:
-        # Restore original file descriptors
-        os.dup2(original_stderr, 2)
-        os.dup2(original_stdout, 1)
-        os.close(original_stderr)
-        os.close(original_stdout)
+    return shaped_view
+
+
+class _RawFrameWriter:
+    """Writes uncompressed BGR frames back-to-back, batching them into one writev() call.
+
+    Exposes the subset of the cv2.VideoWriter interface used by the recorder. Frame
+    geometry is written to a JSON sidecar next to the output file.
+    """
+
+    def __init__(self, filename: str, fps: float, frame_size: tuple, max_batch: int = 8, max_delay: float = 0.2):
+        width, height = frame_size
+        self._frame_bytes = width * height * 3
+        self._batch = [_aligned_empty(self._frame_bytes) for _ in range(max_batch)]
+        self._pending = 0
+        self._max_delay = max_delay  # Longest a staged frame may wait before being flushed
+        self._first_pending_time = 0.0
+        self._fd: Optional[int] = os.open(filename, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+
+        with open(f"{filename}.json", "w") as f:
+            json.dump({"width": width, "height": height, "channels": 3, "dtype": "uint8", "pixel_format": "bgr24", "fps": fps}, f)
+
+    def isOpened(self) -> bool:
+        return self._fd is not None
+
+    def write(self, frame: np.ndarray) -> None:
+        # Frames handed to us are only valid until the next conversion, so stage a copy
+        np.copyto(self._batch[self._pending], frame.reshape(-1))
+        if self._pending == 0:
+            self._first_pending_time = time.monotonic()
+        self._pending += 1
+        if self._pending == len(self._batch):
+            self.flush()
+        else:
+            self.poll()
+
+    def poll(self) -> None:
+        """Flush staged frames that have waited longer than max_delay (keeps slow recordings on disk)"""
+        if self._pending and time.monotonic() - self._first_pending_time >= self._max_delay:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write all staged frames with a single writev() call"""
+        if self._pending and self._fd is not None:
+            buffers = [memoryview(buf) for buf in self._batch[: self._pending]]
+            written = os.writev(self._fd, buffers)
+            total = self._pending * self._frame_bytes
+            while written < total:
+                # Short write; push the remainder out
+                remainder = b"".join(buffers)[written:]
+                written += os.write(self._fd, remainder)
+        self._pending = 0
+
+    def release(self) -> None:
+        if self._fd is not None:
+            try:
+                self.flush()
+            finally:
+                os.close(self._fd)
+                self._fd = None
 
 
 class CameraRecorder:
     """Handles video recording for a single camera"""
 
-    def __init__(self, camera_config: CameraConfig, device_info: Any, state_manager: StateManager, event_system: EventSystem, storage_manager=None):
+    # Number of frame slots between the capture and writer threads
+    RING_SLOTS = 8
+
+    # Consecutive late frames before a backpressure warning is logged
+    BACKPRESSURE_WARN_FRAMES = 30
+
+    # Seconds to wait for the frame writer to drain when a recording ends
+    WRITER_JOIN_TIMEOUT = 5.0
+
+    # Seconds to wait for the streamer to release its own camera session when a recording starts
+    CAMERA_HANDOVER_TIMEOUT = 3.0
+
+    def __init__(self, camera_config: CameraConfig, device_info: Any, state_manager: StateManager, event_system: EventSystem, storage_manager=None, frame_bus: Optional[FrameBus] = None):
         self.camera_config = camera_config
         self.device_info = device_info
         self.state_manager = state_manager
         self.event_system = event_system
         self.storage_manager = storage_manager
+        self.frame_bus = frame_bus  # Shares recorded frames with the streamer while this recorder owns the camera
         self.logger = logging.getLogger(f"{__name__}.{camera_config.name}")
 
         # Camera handle and properties
         self.hCamera: Optional[int] = None
         self.cap = None
         self.monoCamera = False
-        self.frame_buffer = None
+        self.frame_buffers: List[int] = []  # SDK-allocated ISP output buffers, used as the recording ring
         self.frame_buffer_size = 0
+        self._soft_trigger = False  # Camera exposes frames only on software trigger (paced capture)
+        self._frame_views: List[np.ndarray] = []  # Zero-copy views over frame_buffers
+        self._bgr_out: Optional[np.ndarray] = None  # Reused BGR conversion output
+        self._gray_out: Optional[np.ndarray] = None  # Reused 8-bit mono scratch for >8-bit mono
 
         # Recording state
-        self.recording = False
+        self._recording_flag = threading.Event()  # Set while recording; readable without taking _lock
         self.video_writer: Optional[cv2.VideoWriter] = None
+        self._writer_frame_size: Optional[tuple] = None  # (width, height) the writer was opened with
         self.output_filename: Optional[str] = None
         self.frame_count = 0
+        self.dropped_frames = 0  # Frames dropped because the writer fell behind
         self.start_time: Optional[datetime] = None
 
         # Threading
         self._recording_thread: Optional[threading.Thread] = None
+        self._writer_thread: Optional[threading.Thread] = None
+        self._frame_ring: Optional[_FrameRing] = None
+        self._session: Optional[_RecordingSession] = None
+        self._producer_attached = False  # Whether we own this camera on the frame bus
+        self._producer_lock = threading.Lock()
         self._stop_recording_event = threading.Event()
         self._lock = threading.RLock()
 
@@ -85,6 +310,11 @@ class CameraRecorder:
         # Camera will be initialized when recording starts
         self.logger.info(f"Camera recorder created for: {self.camera_config.name} (lazy initialization)")
 
+    @property
+    def recording(self) -> bool:
+        """Whether a recording is in progress"""
+        return self._recording_flag.is_set()
+
     def _initialize_camera(self) -> bool:
         """Initialize the camera with configured settings"""
         try:
@@ -136,7 +366,17 @@ class CameraRecorder:
             # Allocate frame buffer based on bit depth
             bytes_per_pixel = self._get_bytes_per_pixel()
             self.frame_buffer_size = self.cap.sResolutionRange.iWidthMax * self.cap.sResolutionRange.iHeightMax * bytes_per_pixel
-            self.frame_buffer = mvsdk.CameraAlignMalloc(self.frame_buffer_size, 16)
+            # One ISP output buffer per ring slot, so the ISP can fill frame K+1 while frame K is being encoded
+            self.frame_buffers = [mvsdk.CameraAlignMalloc(self.frame_buffer_size, FRAME_ALIGNMENT) for _ in range(self.RING_SLOTS)]
+
+            # Cache a numpy view over each SDK buffer once instead of rebuilding it every frame
+            self._frame_views = [np.frombuffer(memoryview((mvsdk.c_ubyte * self.frame_buffer_size).from_address(buffer)), dtype=np.uint8) for buffer in self.frame_buffers]
+            # Pre-allocate conversion outputs for the formats that cannot be written as a plain view
+            max_pixels = self.cap.sResolutionRange.iWidthMax * self.cap.sResolutionRange.iHeightMax
+            if self.monoCamera or self.camera_config.bit_depth > 8:
+                self._bgr_out = _aligned_empty(max_pixels * 3)
+            if self.monoCamera and self.camera_config.bit_depth > 8:
+                self._gray_out = _aligned_empty(max_pixels)
 
             # Start camera
             mvsdk.CameraPlay(self.hCamera)
@@ -180,8 +420,8 @@ class CameraRecorder:
     def _configure_camera_settings(self) -> None:
         """Configure camera settings from config"""
         try:
-            # Set trigger mode (continuous acquisition)
-            mvsdk.CameraSetTriggerMode(self.hCamera, 0)
+            # Set trigger mode (software-triggered when pacing to a target FPS, otherwise continuous)
+            self._configure_trigger_mode()
 
             # Set manual exposure
             mvsdk.CameraSetAeState(self.hCamera, 0)  # Disable auto exposure
@@ -205,10 +445,15 @@ class CameraRecorder:
             # Configure advanced settings
             self._configure_advanced_settings()
 
-            self.logger.info(f"Camera settings configured - Exposure: {exposure_us}μs, Gain: {gain_value}")
+            self.logger.info("Camera settings configured - Exposure: %sμs, Gain: %s", exposure_us, gain_value)
 
         except Exception as e:
-            self.logger.warning(f"Error configuring camera settings: {e}")
+            self.logger.warning("Error configuring camera settings: %s", e)
+
+    def _configure_trigger_mode(self) -> None:
+        """Use software triggering when a target FPS is set so the sensor only exposes frames we record"""
+        self._soft_trigger = self.camera_config.target_fps > 0
+        mvsdk.CameraSetTriggerMode(self.hCamera, 1 if self._soft_trigger else 0)
 
     def _configure_image_quality(self) -> None:
         """Configure image quality settings"""
@@ -226,10 +471,10 @@ class CameraRecorder:
             if not self.monoCamera:
                 mvsdk.CameraSetSaturation(self.hCamera, self.camera_config.saturation)
 
-            self.logger.info(f"Image quality configured - Sharpness: {self.camera_config.sharpness}, " f"Contrast: {self.camera_config.contrast}, Gamma: {self.camera_config.gamma}")
+            self.logger.info("Image quality configured - Sharpness: %s, Contrast: %s, Gamma: %s", self.camera_config.sharpness, self.camera_config.contrast, self.camera_config.gamma)
 
         except Exception as e:
-            self.logger.warning(f"Error configuring image quality: {e}")
+            self.logger.warning("Error configuring image quality: %s", e)
 
     def _configure_noise_reduction(self) -> None:
         """Configure noise reduction settings"""
@@ -245,10 +490,10 @@ class CameraRecorder:
             else:
                 mvsdk.CameraSetDenoise3DParams(self.hCamera, False, 2, None)
 
-            self.logger.info(f"Noise reduction configured - Filter: {self.camera_config.noise_filter_enabled}, " f"3D Denoise: {self.camera_config.denoise_3d_enabled}")
+            self.logger.info("Noise reduction configured - Filter: %s, 3D Denoise: %s", self.camera_config.noise_filter_enabled, self.camera_config.denoise_3d_enabled)
 
         except Exception as e:
-            self.logger.warning(f"Error configuring noise reduction: {e}")
+            self.logger.warning("Error configuring noise reduction: %s", e)
 
     def _configure_color_settings(self) -> None:
         """Configure color settings for color cameras"""
@@ -266,10 +511,12 @@ class CameraRecorder:
                 blue_gain = int(self.camera_config.wb_blue_gain * 100)
                 mvsdk.CameraSetUserClrTempGain(self.hCamera, red_gain, green_gain, blue_gain)
 
-            self.logger.info(f"Color settings configured - Auto WB: {self.camera_config.auto_white_balance}, " f"Color Temp Preset: {self.camera_config.color_temperature_preset}, " f"RGB Gains: R={self.camera_config.wb_red_gain}, G={self.camera_config.wb_green_gain}, B={self.camera_config.wb_blue_gain}")
+            if self.logger.isEnabledFor(logging.INFO):
+                config = self.camera_config
+                self.logger.info("Color settings configured - Auto WB: %s, Color Temp Preset: %s, RGB Gains: R=%s, G=%s, B=%s", config.auto_white_balance, config.color_temperature_preset, config.wb_red_gain, config.wb_green_gain, config.wb_blue_gain)
 
         except Exception as e:
-            self.logger.warning(f"Error configuring color settings: {e}")
+            self.logger.warning("Error configuring color settings: %s", e)
 
     def _configure_advanced_settings(self) -> None:
         """Configure advanced camera settings"""
@@ -285,16 +532,18 @@ class CameraRecorder:
                 if self.camera_config.hdr_enabled:
                     mvsdk.CameraSetHDR(self.hCamera, 1)  # Enable HDR
                     mvsdk.CameraSetHDRGainMode(self.hCamera, self.camera_config.hdr_gain_mode)
-                    self.logger.info(f"HDR enabled with gain mode: {self.camera_config.hdr_gain_mode}")
+                    self.logger.info("HDR enabled with gain mode: %s", self.camera_config.hdr_gain_mode)
                 else:
                     mvsdk.CameraSetHDR(self.hCamera, 0)  # Disable HDR
             except AttributeError:
                 self.logger.info("HDR functions not available in this SDK version, skipping HDR configuration")
 
-            self.logger.info(f"Advanced settings configured - Anti-flicker: {self.camera_config.anti_flicker_enabled}, " f"Light Freq: {self.camera_config.light_frequency}Hz, HDR: {self.camera_config.hdr_enabled}")
+            if self.logger.isEnabledFor(logging.INFO):
+                config = self.camera_config
+                self.logger.info("Advanced settings configured - Anti-flicker: %s, Light Freq: %sHz, HDR: %s", config.anti_flicker_enabled, config.light_frequency, config.hdr_enabled)
 
         except Exception as e:
-            self.logger.warning(f"Error configuring advanced settings: {e}")
+            self.logger.warning("Error configuring advanced settings: %s", e)
 
     def update_camera_settings(self, exposure_ms: Optional[float] = None, gain: Optional[float] = None, target_fps: Optional[float] = None) -> bool:
         """Update camera settings dynamically"""
@@ -325,6 +574,7 @@ class CameraRecorder:
             # Update target FPS if provided
             if target_fps is not None:
                 self.camera_config.target_fps = target_fps
+                self._configure_trigger_mode()
                 self.logger.info(f"Updated target FPS: {target_fps}")
                 settings_updated = True
 
@@ -359,6 +609,7 @@ class CameraRecorder:
 
             if "target_fps" in kwargs and kwargs["target_fps"] is not None:
                 self.camera_config.target_fps = kwargs["target_fps"]
+                self._configure_trigger_mode()
                 settings_updated = True
 
             # Update image quality settings
@@ -472,15 +723,24 @@ class CameraRecorder:
     def start_recording(self, filename: str) -> bool:
         """Start video recording"""
         with self._lock:
-            if self.recording:
+            if self._recording_flag.is_set():
                 self.logger.warning("Already recording!")
                 return False
 
+            if self._writer_thread is not None and self._writer_thread.is_alive():
+                self.logger.error("Frame writer from the previous recording is still running, cannot start recording")
+                return False
+
+            # Claim the camera on the frame bus before opening it: a streamer running its own
+            # session releases the camera and previews our frames instead
+            self._attach_producer()
+
             # Initialize camera if not already initialized (lazy initialization)
             if not self.hCamera:
                 self.logger.info("Camera not initialized, initializing now...")
                 if not self._initialize_camera():
                     self.logger.error("Failed to initialize camera for recording")
+                    self._detach_producer()
                     return False
 
             try:
@@ -488,14 +748,10 @@ class CameraRecorder:
                 output_path = os.path.join(self.camera_config.storage_path, filename)
                 Path(self.camera_config.storage_path).mkdir(parents=True, exist_ok=True)
 
-                # Test camera capture before starting recording
-                if not self._test_camera_capture():
-                    self.logger.error("Camera capture test failed")
-                    return False
-
                 # Initialize recording state
                 self.output_filename = output_path
                 self.frame_count = 0
+                self.dropped_frames = 0
                 self.start_time = now_atlanta()  # Use Atlanta timezone
                 self._stop_recording_event.clear()
 
@@ -504,7 +760,7 @@ class CameraRecorder:
                 self._recording_thread.start()
 
                 # Update state
-                self.recording = True
+                self._recording_flag.set()
                 recording_id = self.state_manager.start_recording(self.camera_config.name, output_path)
 
                 # Publish event
@@ -516,24 +772,13 @@ class CameraRecorder:
             except Exception as e:
                 self.logger.error(f"Error starting recording: {e}")
                 publish_recording_error(self.camera_config.name, str(e))
+                self._detach_producer()
                 return False
 
-    def _test_camera_capture(self) -> bool:
-        """Test if camera can capture frames"""
-        try:
-            # Try to capture one frame
-            pRawData, FrameHead = mvsdk.CameraGetImageBuffer(self.hCamera, 1000)  # 1 second timeout
-            mvsdk.CameraImageProcess(self.hCamera, pRawData, self.frame_buffer, FrameHead)
-            mvsdk.CameraReleaseImageBuffer(self.hCamera, pRawData)
-            return True
-        except Exception as e:
-            self.logger.error(f"Camera capture test failed: {e}")
-            return False
-
     def stop_recording(self) -> bool:
         """Stop video recording"""
         with self._lock:
-            if not self.recording:
+            if not self._recording_flag.is_set():
                 self.logger.warning("Not currently recording")
                 return False
 
@@ -541,12 +786,16 @@ class CameraRecorder:
                 # Signal recording thread to stop
                 self._stop_recording_event.set()
 
-                # Wait for recording thread to finish
+                # Wait for recording thread to finish (it waits for the frame writer in turn). If it
+                # is stuck, the ring buffers are freed by whichever recording thread exits last.
                 if self._recording_thread and self._recording_thread.is_alive():
-                    self._recording_thread.join(timeout=5)
+                    self._recording_thread.join(timeout=self.WRITER_JOIN_TIMEOUT + 1.0)
+                    if self._recording_thread.is_alive():
+                        self.logger.error("Recording thread did not stop in time, marking the recording as failed")
+                        publish_recording_error(self.camera_config.name, "Recording thread did not stop in time")
 
                 # Update state
-                self.recording = False
+                self._recording_flag.clear()
 
                 # Calculate duration and file size
                 duration = 0
@@ -564,11 +813,12 @@ class CameraRecorder:
                 # Publish event
                 publish_recording_stopped(self.camera_config.name, self.output_filename or "unknown", duration)
 
-                # Clean up camera resources after recording (lazy cleanup)
+                # Clean up camera resources after recording (lazy cleanup), then let the streamer reopen it
                 self._cleanup_camera()
+                self._detach_producer()
                 self.logger.info("Camera resources cleaned up after recording")
 
-                self.logger.info(f"Stopped recording - Duration: {duration:.1f}s, Frames: {self.frame_count}")
+                self.logger.info(f"Stopped recording - Duration: {duration:.1f}s, Frames: {self.frame_count}, Dropped: {self.dropped_frames}")
                 return True
 
             except Exception as e:
@@ -576,37 +826,61 @@ class CameraRecorder:
                 return False
 
     def _recording_loop(self) -> None:
-        """Main recording loop running in separate thread"""
+        """Main recording loop running in separate thread (capture + ISP only)"""
+        session = None
         try:
             # Initialize video writer
             if not self._initialize_video_writer():
                 self.logger.error("Failed to initialize video writer")
                 return
 
+            # Hand frames to a dedicated writer thread so encoding never blocks the camera drain.
+            # One writer per recording drains this camera's ring, which keeps frames in order.
+            self._frame_ring = _FrameRing(self.frame_buffers)
+            session = self._session = _RecordingSession(users=2, logger=self.logger)  # This thread and the writer
+            self._writer_thread = threading.Thread(target=self._writer_loop, args=(session,), name=f"writer-{self.camera_config.name}", daemon=True)
+            self._writer_thread.start()
+
             self.logger.info("Recording loop started")
 
+            # Trigger against absolute deadlines so capture/encode jitter does not accumulate
+            loop_start = time.monotonic()
+            frames_captured = 0
+            frames_behind = 0
+            grab_timeout_ms = 200 + int(self.camera_config.exposure_ms)  # Triggered frames still need exposing
+
+            # Hoist the per-frame SDK calls and handles into locals
+            h_camera = self.hCamera
+            get_image_buffer = mvsdk.CameraGetImageBuffer
+            release_image_buffer = mvsdk.CameraReleaseImageBuffer
+            write_async = self._write_async
+
             while not self._stop_recording_event.is_set():
                 try:
-                    # Capture frame
-                    pRawData, FrameHead = mvsdk.CameraGetImageBuffer(self.hCamera, 200)  # 200ms timeout
-
-                    # Process frame
-                    mvsdk.CameraImageProcess(self.hCamera, pRawData, self.frame_buffer, FrameHead)
+                    # Control frame rate: wait for this frame's deadline, then trigger exactly one exposure
+                    if self._soft_trigger:
+                        target_fps = self.camera_config.target_fps
+                        if target_fps > 0:
+                            remaining = loop_start + frames_captured / target_fps - time.monotonic()
+                            if remaining > 0:
+                                if self._stop_recording_event.wait(remaining):
+                                    break
+                                frames_behind = 0
+                            else:
+                                frames_behind += 1
+                                if frames_behind == self.BACKPRESSURE_WARN_FRAMES:
+                                    self.logger.warning(f"Recording is falling behind target FPS ({target_fps}) by {-remaining * 1000:.1f}ms")
+                        mvsdk.CameraSoftTrigger(h_camera)
 
-                    # Convert to OpenCV format
-                    frame = self._convert_frame_to_opencv(FrameHead)
+                    # Capture frame
+                    pRawData, FrameHead = get_image_buffer(h_camera, grab_timeout_ms)
 
-                    # Write frame to video
-                    if frame is not None and self.video_writer:
-                        self.video_writer.write(frame)
-                        self.frame_count += 1
+                    # Process the frame into the ring for the writer thread (never blocks)
+                    write_async(pRawData, FrameHead)
+                    frames_captured += 1
 
                     # Release buffer
-                    mvsdk.CameraReleaseImageBuffer(self.hCamera, pRawData)
-
-                    # Control frame rate (skip sleep if target_fps is 0 for maximum speed)
-                    if self.camera_config.target_fps > 0:
-                        time.sleep(1.0 / self.camera_config.target_fps)
+                    release_image_buffer(h_camera, pRawData)
 
                 except mvsdk.CameraException as e:
                     if e.error_code == mvsdk.CAMERA_STATUS_TIME_OUT:
@@ -624,32 +898,143 @@ class CameraRecorder:
             self.logger.error(f"Fatal error in recording loop: {e}")
             publish_recording_error(self.camera_config.name, str(e))
         finally:
-            self._cleanup_recording()
+            if not self._stop_recording_event.is_set():
+                # The recording ended on its own; stop_recording() will not run to hand the camera back
+                self._detach_producer()
 
-    def _initialize_video_writer(self) -> bool:
-        """Initialize OpenCV video writer"""
+            if session is None:
+                self._cleanup_recording()
+            else:
+                # Let the writer drain the remaining frames before releasing the video writer
+                session.capture_done.set()
+                self._writer_thread.join(timeout=self.WRITER_JOIN_TIMEOUT)
+                if self._writer_thread.is_alive():
+                    # The writer still reads the ring buffers and writes the file; it releases
+                    # them when it exits, and no new recording starts until it has
+                    self.logger.error(f"Frame writer did not finish within {self.WRITER_JOIN_TIMEOUT}s, marking the recording as failed")
+                    publish_recording_error(self.camera_config.name, "Frame writer did not finish writing the recording")
+                self._cleanup_recording(session)
+                session.done()
+
+    def _attach_producer(self) -> None:
+        """Take the camera over on the frame bus, waiting for the streamer to release its own session"""
+        if self.frame_bus is None:
+            return
+        with self._producer_lock:
+            if self._producer_attached:
+                return
+            self.frame_bus.attach_producer(self.camera_config.name)
+            self._producer_attached = True
+        if not self.frame_bus.wait_for_sessions_closed(self.camera_config.name, self.CAMERA_HANDOVER_TIMEOUT):
+            self.logger.warning("Streamer did not release the camera in time, opening it anyway")
+
+    def _detach_producer(self) -> None:
+        """Give the camera back on the frame bus so the streamer can reopen its own session"""
+        with self._producer_lock:
+            if not self._producer_attached:
+                return
+            self._producer_attached = False
+        self.frame_bus.detach_producer(self.camera_config.name)
+
+    def _write_async(self, raw_data, frame_head) -> bool:
+        """Run the ISP straight into the next free ring slot, dropping the frame if the writer is behind"""
+        buffer = self._frame_ring.acquire()
+        if buffer is None:
+            # Skip the ISP pass entirely for frames that would be dropped anyway
+            self.dropped_frames += 1
+            return False
+
+        mvsdk.CameraImageProcess(self.hCamera, raw_data, buffer, frame_head)
+        self._frame_ring.publish((frame_head.iWidth, frame_head.iHeight, frame_head.uBytes))
+        return True
+
+    def _writer_loop(self, session: _RecordingSession) -> None:
+        """Drain captured frames from the ring, convert and write them to the video file"""
+        ring = self._frame_ring
+        # Hoist everything the per-frame path touches into locals; the video writer is kept local
+        # too, since the recorder stops tracking it if this thread outlives the recording
+        convert = self._build_frame_converter()
+        peek, release, wait = ring.peek, ring.release, ring.wait
+        capture_done = session.capture_done.is_set
+        video_writer = self.video_writer
+        raw_writer = isinstance(video_writer, _RawFrameWriter)
+        write = video_writer.write
+        camera_name = self.camera_config.name
+        frame_due = self.frame_bus.frame_due if self.frame_bus is not None else None
+        first_frame = True
         try:
-            # Get frame dimensions by capturing a test frame
-            pRawData, FrameHead = mvsdk.CameraGetImageBuffer(self.hCamera, 1000)
-            mvsdk.CameraImageProcess(self.hCamera, pRawData, self.frame_buffer, FrameHead)
-            mvsdk.CameraReleaseImageBuffer(self.hCamera, pRawData)
+            while True:
+                item = peek()
+                if item is None:
+                    if capture_done():
+                        break
+                    if raw_writer:
+                        video_writer.poll()
+                    wait(0.1)
+                    continue
+
+                index, (width, height, _) = item
+
+                # The writer was sized from the configured resolution; reopen it if the camera disagrees
+                if first_frame:
+                    first_frame = False
+                    if (width, height) != self._writer_frame_size:
+                        self.logger.warning(f"Frame size {(width, height)} differs from expected {self._writer_frame_size}, reopening video writer")
+                        video_writer.release()
+                        self.video_writer = None
+                        if not self._initialize_video_writer((width, height)):
+                            break
+                        video_writer = self.video_writer
+                        raw_writer = isinstance(video_writer, _RawFrameWriter)
+                        write = video_writer.write
+
+                # Convert and write frame to video
+                try:
+                    frame = convert(index, width, height)
+                    write(frame)
+                    self.frame_count += 1
 
+                    # Hand a preview frame to the streamer when one is due (it copies the frame)
+                    if frame_due is not None and frame_due(camera_name):
+                        self.frame_bus.publish(camera_name, frame)
+                except Exception as e:
+                    self.logger.error(f"Error converting frame: {e}")
+
+                release()
+
+        except Exception as e:
+            self.logger.error(f"Error in writer loop: {e}")
+        finally:
+            session.done()
+
+    def _initialize_video_writer(self, frame_size: Optional[tuple] = None) -> bool:
+        """Initialize OpenCV video writer (sized from the camera resolution unless frame_size is given)"""
+        try:
             # Set up video writer with configured codec
             fourcc = cv2.VideoWriter_fourcc(*self.camera_config.video_codec)
-            frame_size = (FrameHead.iWidth, FrameHead.iHeight)
+            frame_size = frame_size or self._get_frame_size()
+            self._writer_frame_size = frame_size
 
             # Use 30 FPS for video writer if target_fps is 0 (unlimited)
             video_fps = self.camera_config.target_fps if self.camera_config.target_fps > 0 else 30.0
 
-            # Create video writer with quality settings
-            self.video_writer = cv2.VideoWriter(self.output_filename, fourcc, video_fps, frame_size)
+            if self.camera_config.video_format == "raw":
+                # Uncompressed frames, batched into writev() calls
+                self.video_writer = _RawFrameWriter(self.output_filename, video_fps, frame_size)
+            elif self.camera_config.video_format == "mp4":
+                # Prefer a hardware/threaded H.264 GStreamer pipeline for MP4 output
+                self.video_writer = self._open_gstreamer_writer(video_fps, frame_size)
 
-            # Set quality if supported (for some codecs)
-            if hasattr(self.video_writer, "set") and self.camera_config.video_quality:
-                try:
-                    self.video_writer.set(cv2.VIDEOWRITER_PROP_QUALITY, self.camera_config.video_quality)
-                except:
-                    pass  # Quality setting not supported for this codec
+            if self.video_writer is None:
+                # Create video writer with quality settings
+                self.video_writer = cv2.VideoWriter(self.output_filename, fourcc, video_fps, frame_size)
+
+                # Set quality if supported (for some codecs)
+                if hasattr(self.video_writer, "set") and self.camera_config.video_quality:
+                    try:
+                        self.video_writer.set(cv2.VIDEOWRITER_PROP_QUALITY, self.camera_config.video_quality)
+                    except:
+                        pass  # Quality setting not supported for this codec
 
             if not self.video_writer.isOpened():
                 self.logger.error(f"Failed to open video writer for {self.output_filename}")
@@ -662,55 +1047,140 @@ class CameraRecorder:
             self.logger.error(f"Error initializing video writer: {e}")
             return False
 
-    def _convert_frame_to_opencv(self, frame_head) -> Optional[np.ndarray]:
-        """Convert camera frame to OpenCV format"""
+    def _open_gstreamer_writer(self, video_fps: float, frame_size: tuple) -> Optional[cv2.VideoWriter]:
+        """Open a GStreamer H.264 video writer, or return None if no encoder pipeline is usable"""
+        global _gstreamer_encoder
+
+        if not gstreamer_available():
+            return None
+
+        encoders = GSTREAMER_ENCODERS
+        if _gstreamer_encoder is not None:
+            encoders = (_gstreamer_encoder,) + tuple(e for e in GSTREAMER_ENCODERS if e != _gstreamer_encoder)
+
+        for encoder in encoders:
+            pipeline = f'appsrc ! videoconvert ! {encoder} ! h264parse ! mp4mux ! filesink location="{self.output_filename}"'
+            try:
+                writer = cv2.VideoWriter(pipeline, cv2.CAP_GSTREAMER, 0, video_fps, frame_size, True)
+                if writer.isOpened():
+                    _gstreamer_encoder = encoder
+                    self.logger.info(f"Using GStreamer encoder: {encoder.split()[0]}")
+                    return writer
+                writer.release()
+            except Exception as e:
+                self.logger.debug(f"GStreamer encoder {encoder.split()[0]} unavailable: {e}")
+
+        self.logger.info("No GStreamer encoder available, falling back to OpenCV codec writer")
+        return None
+
+    def _get_frame_size(self) -> tuple:
+        """Get the output frame size (width, height) without grabbing a frame"""
+        # Prefer the currently configured resolution/ROI, fall back to the sensor maximum
         try:
-            # Convert the frame buffer memory address to a proper buffer
-            # that numpy can work with using mvsdk.c_ubyte
-            frame_data_buffer = (mvsdk.c_ubyte * frame_head.uBytes).from_address(self.frame_buffer)
-
-            # Handle different bit depths
-            if self.camera_config.bit_depth > 8:
-                # For >8-bit, data is stored as 16-bit values
-                frame_data = np.frombuffer(frame_data_buffer, dtype=np.uint16)
-
-                if self.monoCamera:
-                    # Monochrome camera - convert to 8-bit BGR for video
-                    frame = frame_data.reshape((frame_head.iHeight, frame_head.iWidth))
-                    # Scale down to 8-bit (simple right shift)
-                    frame_8bit = (frame >> (self.camera_config.bit_depth - 8)).astype(np.uint8)
-                    frame_bgr = cv2.cvtColor(frame_8bit, cv2.COLOR_GRAY2BGR)
-                else:
-                    # Color camera - convert to 8-bit BGR
-                    frame = frame_data.reshape((frame_head.iHeight, frame_head.iWidth, 3))
-                    # Scale down to 8-bit
-                    frame_bgr = (frame >> (self.camera_config.bit_depth - 8)).astype(np.uint8)
-            else:
-                # 8-bit data
-                frame_data = np.frombuffer(frame_data_buffer, dtype=np.uint8)
+            resolution = mvsdk.CameraGetImageResolution(self.hCamera)
+            if resolution.iWidth > 0 and resolution.iHeight > 0:
+                return (resolution.iWidth, resolution.iHeight)
+        except Exception as e:
+            self.logger.debug(f"Could not read current image resolution: {e}")
 
-                if self.monoCamera:
-                    # Monochrome camera - convert to BGR
-                    frame = frame_data.reshape((frame_head.iHeight, frame_head.iWidth))
-                    frame_bgr = cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
-                else:
-                    # Color camera - already in BGR format
-                    frame_bgr = frame_data.reshape((frame_head.iHeight, frame_head.iWidth, 3))
+        return (self.cap.sResolutionRange.iWidthMax, self.cap.sResolutionRange.iHeightMax)
+
+    def _build_frame_converter(self):
+        """Build a frame converter specialized for this camera's (mono, bit depth) format
 
+        The converter takes a ring slot index plus the frame width/height and returns a BGR
+        frame built from that slot's ISP output. Choosing the variant once per recording keeps
+        the per-frame path free of format branches and attribute lookups, and the shaped views
+        over the slots and scratch buffers are cached so no arrays are created per frame.
+
+        The returned frame is either a view over the slot or a recorder-owned scratch buffer;
+        it is only valid until the next call, so consumers must use (or copy) it before
+        converting another frame. VideoWriter.write copies internally.
+        """
+        frame_views = self._frame_views
+        cvt_color = cv2.cvtColor
+        gray2bgr = cv2.COLOR_GRAY2BGR
+        bgr_view = _shaped_view_cache([self._bgr_out], 3) if self._bgr_out is not None else None
+
+        if self.camera_config.bit_depth <= 8:
+            if not self.monoCamera:
+                color_view = _shaped_view_cache(frame_views, 3)
+
+                def convert_color8(index, width, height):
+                    # Color camera - already in BGR format, zero-copy view
+                    return color_view(index, width, height)
+
+                return convert_color8
+
+            mono_view = _shaped_view_cache(frame_views, 1)
+
+            def convert_mono8(index, width, height):
+                # Monochrome camera - convert to BGR into the pre-allocated output buffer
+                frame_bgr = bgr_view(0, width, height)
+                cvt_color(mono_view(index, width, height), gray2bgr, dst=frame_bgr)
+                return frame_bgr
+
+            return convert_mono8
+
+        # For >8-bit, data is stored as 16-bit values
+        shift = self.camera_config.bit_depth - 8
+        right_shift = np.right_shift
+        copyto = np.copyto
+        frame_views16 = [view.view(np.uint16) for view in frame_views]
+
+        if self.monoCamera and _mono16_to_bgr8 is not None:
+            mono16_to_bgr8 = _mono16_to_bgr8
+            mono16_view = _shaped_view_cache(frame_views16, 1)
+
+            def convert_mono16_jit(index, width, height):
+                # Monochrome camera - fused JIT shift + BGR expansion
+                frame_bgr = bgr_view(0, width, height)
+                mono16_to_bgr8(mono16_view(index, width, height), frame_bgr, shift)
+                return frame_bgr
+
+            return convert_mono16_jit
+
+        if self.monoCamera:
+            mono16_view = _shaped_view_cache(frame_views16, 1)
+            gray_view = _shaped_view_cache([self._gray_out], 1)
+
+            def convert_mono16(index, width, height):
+                # Monochrome camera - scale down in place (the ring slot is ours until released),
+                # narrow to 8-bit, then expand to BGR for video
+                frame_data = mono16_view(index, width, height)
+                right_shift(frame_data, shift, out=frame_data)
+                frame_8bit = gray_view(0, width, height)
+                copyto(frame_8bit, frame_data, casting="unsafe")
+                frame_bgr = bgr_view(0, width, height)
+                cvt_color(frame_8bit, gray2bgr, dst=frame_bgr)
+                return frame_bgr
+
+            return convert_mono16
+
+        color16_view = _shaped_view_cache(frame_views16, 3)
+
+        def convert_color16(index, width, height):
+            # Color camera - scale down in place and narrow to 8-bit BGR
+            frame_data = color16_view(index, width, height)
+            right_shift(frame_data, shift, out=frame_data)
+            frame_bgr = bgr_view(0, width, height)
+            copyto(frame_bgr, frame_data, casting="unsafe")
             return frame_bgr
 
-        except Exception as e:
-            self.logger.error(f"Error converting frame: {e}")
-            return None
+        return convert_color16
 
-    def _cleanup_recording(self) -> None:
+    def _cleanup_recording(self, session: Optional[_RecordingSession] = None) -> None:
         """Clean up recording resources"""
         try:
-            if self.video_writer:
-                self.video_writer.release()
-                self.video_writer = None
+            video_writer, self.video_writer = self.video_writer, None
+            if video_writer is not None:
+                # Release flushes any batched frames and closes the file (once the frame writer is done with it)
+                if session is None:
+                    video_writer.release()
+                else:
+                    session.release_when_idle(video_writer.release)
 
-            self.recording = False
+            self._recording_flag.clear()
 
         except Exception as e:
             self.logger.error(f"Error during recording cleanup: {e}")
@@ -745,7 +1215,7 @@ class CameraRecorder:
             self.logger.info("Attempting to reconnect camera...")
 
             # Stop any ongoing operations
-            if self.recording:
+            if self._recording_flag.is_set():
                 self.logger.info("Stopping recording before reconnect")
                 self.stop_recording()
 
@@ -780,7 +1250,7 @@ class CameraRecorder:
             self.logger.info("Restarting camera grab process...")
 
             # Stop any ongoing recording
-            if self.recording:
+            if self._recording_flag.is_set():
                 self.logger.info("Stopping recording before restart")
                 self.stop_recording()
 
@@ -824,7 +1294,7 @@ class CameraRecorder:
             self.logger.info("Performing full camera reset...")
 
             # Stop any ongoing recording
-            if self.recording:
+            if self._recording_flag.is_set():
                 self.logger.info("Stopping recording before reset")
                 self.stop_recording()
 
@@ -870,14 +1340,7 @@ class CameraRecorder:
 
                 self.hCamera = None
 
-            # Free frame buffer
-            if self.frame_buffer is not None:
-                try:
-                    mvsdk.CameraAlignFree(self.frame_buffer)
-                except:
-                    pass  # Ignore errors during free
-
-                self.frame_buffer = None
+            self._free_frame_buffers()
 
             self.logger.info("Camera resources cleaned up")
 
@@ -888,7 +1351,7 @@ class CameraRecorder:
         """Clean up camera resources"""
         try:
             # Stop recording if active
-            if self.recording:
+            if self._recording_flag.is_set():
                 self.stop_recording()
 
             # Clean up camera
@@ -896,20 +1359,39 @@ class CameraRecorder:
                 mvsdk.CameraUnInit(self.hCamera)
                 self.hCamera = None
 
-            # Free frame buffer
-            if self.frame_buffer:
-                mvsdk.CameraAlignFree(self.frame_buffer)
-                self.frame_buffer = None
+            self._free_frame_buffers()
 
             self.logger.info("Camera resources cleaned up")
 
         except Exception as e:
             self.logger.error(f"Error during cleanup: {e}")
 
+    def _free_frame_buffers(self) -> None:
+        """Free the ring buffers, or leave that to the recording threads while they still use them"""
+        buffers = self.frame_buffers
+
+        # Drop the cached views first, they point into the buffers
+        self._frame_views = []
+        self._bgr_out = None
+        self._gray_out = None
+        self.frame_buffers = []
+
+        def free_buffers():
+            for buffer in buffers:
+                try:
+                    mvsdk.CameraAlignFree(buffer)
+                except:
+                    pass  # Ignore errors during free
+
+        if self._session is None:
+            free_buffers()
+        elif not self._session.release_when_idle(free_buffers):
+            self.logger.warning("Recording threads are still running, frame buffers will be freed when they exit")
+
     def is_recording(self) -> bool:
         """Check if currently recording"""
-        return self.recording
+        return self._recording_flag.is_set()
 
     def get_status(self) -> Dict[str, Any]:
         """Get recorder status"""
-        return {"camera_name": self.camera_config.name, "is_recording": self.recording, "current_file": self.output_filename, "frame_count": self.frame_count, "start_time": self.start_time.isoformat() if self.start_time else None, "camera_initialized": self.hCamera is not None, "storage_path": self.camera_config.storage_path}
+        return {"camera_name": self.camera_config.name, "is_recording": self._recording_flag.is_set(), "current_file": self.output_filename, "frame_count": self.frame_count, "dropped_frames": self.dropped_frames, "start_time": self.start_time.isoformat() if self.start_time else None, "camera_initialized": self.hCamera is not None, "storage_path": self.camera_config.storage_path}
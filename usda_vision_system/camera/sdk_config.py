@@ -7,6 +7,7 @@ This module handles SDK initialization and configuration to suppress error messa
 import sys
 import os
 import logging
+import contextlib
 
 # Add camera SDK to path
 sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", "camera_sdk"))
@@ -17,6 +18,34 @@ logger = logging.getLogger(__name__)
 # Global flag to track SDK initialization
 _sdk_initialized = False
 
+# System options that might control SDK logging output; not every SDK build supports all of them
+_QUIET_SYSOPTS = ("DebugLevel", "ConsoleOutput", "ErrorLog", "LogLevel", "Verbose")
+
+# Options the SDK accepted on first initialization (None until probed)
+_supported_sysopts = None
+
+
+def _configure_sdk_logging():
+    """Set the SDK logging options to "0", probing which ones are supported only once"""
+    global _supported_sysopts
+
+    if _supported_sysopts is not None:
+        # Re-initialization: only apply the options already known to work
+        for option in _supported_sysopts:
+            mvsdk.CameraSetSysOption(option, "0")
+        return
+
+    supported = []
+    for option in _QUIET_SYSOPTS:
+        try:
+            if mvsdk.CameraSetSysOption(option, "0") == 0:
+                supported.append(option)
+        except Exception:
+            pass  # Option not supported by this SDK build
+
+    _supported_sysopts = tuple(supported)
+    logger.debug(f"Configured SDK logging options: {', '.join(_supported_sysopts) or 'none supported'}")
+
 
 def initialize_sdk_with_suppression():
     """Initialize the camera SDK with error suppression"""
@@ -33,41 +62,7 @@ def initialize_sdk_with_suppression():
 
             # Try to set system options to suppress logging
             try:
-                # These are common options that might control logging
-                # We'll try them and ignore failures since they might not be supported
-
-                # Try to disable debug output
-                try:
-                    mvsdk.CameraSetSysOption("DebugLevel", "0")
-                except:
-                    pass
-
-                # Try to disable console output
-                try:
-                    mvsdk.CameraSetSysOption("ConsoleOutput", "0")
-                except:
-                    pass
-
-                # Try to disable error logging
-                try:
-                    mvsdk.CameraSetSysOption("ErrorLog", "0")
-                except:
-                    pass
-
-                # Try to set log level to none
-                try:
-                    mvsdk.CameraSetSysOption("LogLevel", "0")
-                except:
-                    pass
-
-                # Try to disable verbose mode
-                try:
-                    mvsdk.CameraSetSysOption("Verbose", "0")
-                except:
-                    pass
-
-                logger.debug("Attempted to configure SDK logging options")
-
+                _configure_sdk_logging()
             except Exception as e:
                 logger.debug(f"Could not configure SDK logging options: {e}")
 
@@ -82,6 +77,30 @@ def initialize_sdk_with_suppression():
         return False
 
 
+@contextlib.contextmanager
+def suppress_camera_errors():
+    """Context manager to temporarily suppress camera SDK error output"""
+    # Save original file descriptors
+    original_stderr = os.dup(2)
+    original_stdout = os.dup(1)
+
+    try:
+        # Redirect stderr and stdout to devnull
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, 2)  # stderr
+        os.dup2(devnull, 1)  # stdout (in case SDK uses stdout)
+        os.close(devnull)
+
+        yield
+
+    finally:
+        # Restore original file descriptors
+        os.dup2(original_stderr, 2)
+        os.dup2(original_stdout, 1)
+        os.close(original_stderr)
+        os.close(original_stdout)
+
+
 def ensure_sdk_initialized():
     """Ensure the SDK is initialized before camera operations"""
     if not _sdk_initialized:
@@ -2,7 +2,8 @@
 Camera Streamer for the USDA Vision Camera System.
 
 This module provides live preview streaming from GigE cameras without blocking recording.
-It creates a separate camera connection for streaming that doesn't interfere with recording.
+While the camera is recording, the preview is built from the recorder's frames via the
+frame bus; otherwise the streamer opens its own camera connection.
 """
 
 import sys
@@ -12,10 +13,22 @@ import time
 import logging
 import cv2
 import numpy as np
-import contextlib
-from typing import Optional, Dict, Any, Generator
+from typing import Optional, Dict, Any, Generator, Union
 from datetime import datetime
-import queue
+
+try:
+    import simplejpeg
+except ImportError:  # simplejpeg is optional; cv2.imencode is used without it
+    simplejpeg = None
+
+try:
+    from nvjpeg import NvJpeg
+except ImportError:  # GPU JPEG encoding is optional and only used when a CUDA device is present
+    NvJpeg = None
+
+# Each camera's streaming/recording thread is the unit of parallelism; keep OpenCV from
+# spawning its own worker pool per call and oversubscribing the cores
+cv2.setNumThreads(1)
 
 # Add camera SDK to path
 sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", "camera_sdk"))
@@ -24,41 +37,28 @@ import mvsdk
 from ..core.config import CameraConfig
 from ..core.state_manager import StateManager
 from ..core.events import EventSystem
-from .sdk_config import ensure_sdk_initialized
-
-
-@contextlib.contextmanager
-def suppress_camera_errors():
-    """Context manager to temporarily suppress camera SDK error output"""
-    # Save original file descriptors
-    original_stderr = os.dup(2)
-    original_stdout = os.dup(1)
-
-    try:
-        # Redirect stderr and stdout to devnull
-        devnull = os.open(os.devnull, os.O_WRONLY)
-        os.dup2(devnull, 2)  # stderr
-        os.dup2(devnull, 1)  # stdout (in case SDK uses stdout)
-        os.close(devnull)
-
-        yield
-
-    finally:
-        # Restore original file descriptors
-        os.dup2(original_stderr, 2)
-        os.dup2(original_stdout, 1)
-        os.close(original_stderr)
-        os.close(original_stdout)
+from ..core.frame_bus import FrameBus
+from .sdk_config import ensure_sdk_initialized, suppress_camera_errors
 
 
 class CameraStreamer:
     """Provides live preview streaming from cameras without blocking recording"""
 
-    def __init__(self, camera_config: CameraConfig, device_info: Any, state_manager: StateManager, event_system: EventSystem):
+    # Hot-path errors (e.g. every retry while a camera is disconnected) are logged at most this often
+    ERROR_LOG_INTERVAL = 5.0
+
+    # Reopening the camera after a recording ends: the recorder detaches once it has released the camera,
+    # but the device can still report busy briefly, so retry this many times, starting at REOPEN_DELAY
+    # seconds and doubling the wait each time
+    REOPEN_ATTEMPTS = 5
+    REOPEN_DELAY = 0.5
+
+    def __init__(self, camera_config: CameraConfig, device_info: Any, state_manager: StateManager, event_system: EventSystem, frame_bus: Optional[FrameBus] = None):
         self.camera_config = camera_config
         self.device_info = device_info
         self.state_manager = state_manager
         self.event_system = event_system
+        self.frame_bus = frame_bus  # Source of recorder frames while the recorder owns the camera
         self.logger = logging.getLogger(f"{__name__}.{camera_config.name}")
 
         # Camera handle and properties (separate from recorder)
@@ -67,36 +67,60 @@ class CameraStreamer:
         self.monoCamera = False
         self.frame_buffer = None
         self.frame_buffer_size = 0
+        self._np_buffer: Optional[np.ndarray] = None  # Zero-copy view over frame_buffer
+        self._frame_view: Optional[np.ndarray] = None  # _np_buffer shaped for the current frame size
+        self._frame_view_size: Optional[tuple] = None  # (width, height) _frame_view was shaped for
+        self._gpu_encoder = None  # NVJPEG encoder, when available
+        self._bus_session = False  # Whether our own camera session is registered on the frame bus
 
         # Streaming state
-        self.streaming = False
+        self._active = threading.Event()  # Set while streaming; readable without taking _lock
         self._streaming_thread: Optional[threading.Thread] = None
         self._stop_streaming_event = threading.Event()
-        self._frame_queue = queue.Queue(maxsize=5)  # Buffer for latest frames
+        self._latest_jpeg: Optional[Union[bytes, memoryview]] = None  # Newest frame, already JPEG-encoded
+        self._latest_pnm: Optional[bytes] = None  # Newest frame as uncompressed PPM/PGM (only while raw viewers exist)
+        self._latest_pnm_type = b"image/x-portable-pixmap"  # Content type of _latest_pnm
+        self._raw_viewers = 0  # Active uncompressed (same-host) stream consumers
+        self._jpeg_viewers = 0  # Active MJPEG stream consumers
+        self._jpeg_wanted_until = 0.0  # Monotonic time until which get_latest_frame() callers want JPEGs
+        self._frame_seq = 0  # Bumped for every published frame so consumers can tell new frames apart
+        self._frame_lock = threading.Lock()
+        self._frame_ready = threading.Condition(self._frame_lock)  # Notified on every published frame
+        self._last_error_log = 0.0  # Monotonic time of the last rate-limited error log
+        self._suppressed_errors = 0  # Errors dropped by _log_err since then
         self._lock = threading.RLock()
 
         # Stream settings (optimized for preview)
         self.preview_fps = 10.0  # Lower FPS for preview to reduce load
         self.preview_quality = 70  # JPEG quality for streaming
 
+    @property
+    def streaming(self) -> bool:
+        """Whether streaming is active"""
+        return self._active.is_set()
+
     def start_streaming(self) -> bool:
         """Start streaming preview frames"""
         with self._lock:
-            if self.streaming:
+            if self._active.is_set():
                 self.logger.warning("Streaming already active")
                 return True
 
             try:
-                # Initialize camera for streaming
-                if not self._initialize_camera():
-                    return False
+                # Preview the recorder's frames if it already owns the camera, otherwise open our own session
+                use_frame_bus = self.frame_bus is not None and self.frame_bus.has_producer(self.camera_config.name)
+                if not use_frame_bus and not self._initialize_camera():
+                    # A recording may have taken the camera since the check above
+                    if self.frame_bus is None or not self.frame_bus.has_producer(self.camera_config.name):
+                        return False
+                    use_frame_bus = True
 
                 # Start streaming thread
                 self._stop_streaming_event.clear()
-                self._streaming_thread = threading.Thread(target=self._streaming_loop, daemon=True)
+                self._streaming_thread = threading.Thread(target=self._stream, args=(use_frame_bus,), daemon=True)
                 self._streaming_thread.start()
 
-                self.streaming = True
+                self._active.set()
                 self.logger.info(f"Started streaming for camera: {self.camera_config.name}")
                 return True
 
@@ -108,12 +132,15 @@ class CameraStreamer:
     def stop_streaming(self) -> bool:
         """Stop streaming preview frames"""
         with self._lock:
-            if not self.streaming:
+            if not self._active.is_set():
                 return True
 
             try:
-                # Signal streaming thread to stop
+                # Signal streaming thread to stop and wake any viewers waiting for a frame
                 self._stop_streaming_event.set()
+                self._active.clear()
+                with self._frame_ready:
+                    self._frame_ready.notify_all()
 
                 # Wait for thread to finish
                 if self._streaming_thread and self._streaming_thread.is_alive():
@@ -122,7 +149,10 @@ class CameraStreamer:
                 # Cleanup camera resources
                 self._cleanup_camera()
 
-                self.streaming = False
+                # Don't serve the last frame of this session to the next one
+                self._latest_jpeg = None
+                self._latest_pnm = None
+
                 self.logger.info(f"Stopped streaming for camera: {self.camera_config.name}")
                 return True
 
@@ -130,30 +160,81 @@ class CameraStreamer:
                 self.logger.error(f"Error stopping streaming: {e}")
                 return False
 
-    def get_latest_frame(self) -> Optional[bytes]:
-        """Get the latest frame as JPEG bytes for streaming"""
+    def get_latest_frame(self) -> Optional[Union[bytes, memoryview]]:
+        """Get the latest frame as JPEG bytes (or a view of the encoder output) for streaming"""
+        # Frames are encoded once by the streaming thread and shared by every consumer; polling
+        # keeps the encoder running for a second, so the first call may return None
+        self._jpeg_wanted_until = time.monotonic() + 1.0
+        return self._latest_jpeg
+
+    def _encode_jpeg(self, frame: np.ndarray) -> Union[bytes, memoryview]:
+        """Encode a BGR or single-channel frame as JPEG on the GPU or, failing that, with libjpeg-turbo via simplejpeg"""
+        if self._gpu_encoder is not None and frame.ndim == 3:
+            return self._gpu_encoder.encode(frame, self.preview_quality)
+
+        if simplejpeg is not None:
+            if frame.ndim == 2:
+                return simplejpeg.encode_jpeg(frame[..., None], quality=self.preview_quality, colorspace="GRAY", fastdct=True)
+            return simplejpeg.encode_jpeg(frame, quality=self.preview_quality, colorspace="BGR", fastdct=True)
+
+        # Baseline, non-optimized Huffman coding is the fastest path for a low-latency preview
+        # (and lets an OpenCV built against libjpeg-turbo take its direct BGR input path)
+        _, buffer = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, self.preview_quality, cv2.IMWRITE_JPEG_OPTIMIZE, 0, cv2.IMWRITE_JPEG_PROGRESSIVE, 0])
+        # Expose the encoder's output buffer directly instead of copying it with tobytes()
+        return memoryview(buffer.reshape(-1))
+
+    def _encode_pnm(self, frame: np.ndarray) -> bytes:
+        """Wrap a frame in a PPM (color) or PGM (mono) header without compressing it"""
+        height, width = frame.shape[:2]
+        if frame.ndim == 2:
+            return b"".join((b"P5\n%d %d\n255\n" % (width, height), frame))
+        # PPM samples are RGB
+        return b"".join((b"P6\n%d %d\n255\n" % (width, height), cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)))
+
+    def get_latest_frame_pnm(self) -> Optional[bytes]:
+        """Get the latest frame as uncompressed PPM/PGM bytes (only produced while a raw stream is open)"""
+        return self._latest_pnm
+
+    def get_raw_frame_generator(self) -> Generator[bytes, None, None]:
+        """Generator for uncompressed PPM/PGM streaming, for same-host viewers where JPEG is pure overhead"""
+        with self._frame_lock:
+            self._raw_viewers += 1
         try:
-            # Get latest frame from queue (non-blocking)
-            frame = self._frame_queue.get_nowait()
-
-            # Encode as JPEG
-            _, buffer = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, self.preview_quality])
-            return buffer.tobytes()
-
-        except queue.Empty:
-            return None
-        except Exception as e:
-            self.logger.error(f"Error getting latest frame: {e}")
-            return None
+            active = self._active.is_set
+            frame_ready = self._frame_ready
+            last_seq = -1
+            while active():
+                # Sleep until the streaming thread publishes a new frame (or streaming stops)
+                with frame_ready:
+                    frame_ready.wait_for(lambda: (self._frame_seq != last_seq and self._latest_pnm is not None) or not active(), 1.0)
+                    seq, frame_bytes, content_type = self._frame_seq, self._latest_pnm, self._latest_pnm_type
+                if frame_bytes and seq != last_seq:
+                    last_seq = seq
+                    yield b"".join((b"--frame\r\nContent-Type: ", content_type, b"\r\n\r\n", frame_bytes, b"\r\n"))
+        finally:
+            with self._frame_lock:
+                self._raw_viewers -= 1
 
     def get_frame_generator(self) -> Generator[bytes, None, None]:
         """Generator for MJPEG streaming"""
-        while self.streaming:
-            frame_bytes = self.get_latest_frame()
-            if frame_bytes:
-                yield (b"--frame\r\n" b"Content-Type: image/jpeg\r\n\r\n" + frame_bytes + b"\r\n")
-            else:
-                time.sleep(0.1)  # Wait a bit if no frame available
+        with self._frame_lock:
+            self._jpeg_viewers += 1
+        try:
+            active = self._active.is_set
+            frame_ready = self._frame_ready
+            last_seq = -1
+            while active():
+                # Sleep until the streaming thread publishes a new frame (or streaming stops)
+                with frame_ready:
+                    frame_ready.wait_for(lambda: (self._frame_seq != last_seq and self._latest_jpeg is not None) or not active(), 1.0)
+                    seq, frame_bytes = self._frame_seq, self._latest_jpeg
+                if frame_bytes and seq != last_seq:
+                    last_seq = seq
+                    # Build the part in a single copy of the frame (chained + would copy it twice)
+                    yield b"".join((b"--frame\r\nContent-Type: image/jpeg\r\n\r\n", frame_bytes, b"\r\n"))
+        finally:
+            with self._frame_lock:
+                self._jpeg_viewers -= 1
 
     def _initialize_camera(self) -> bool:
         """Initialize camera for streaming (separate from recording)"""
@@ -168,6 +249,13 @@ class CameraStreamer:
                 self.logger.error("No device info provided for camera initialization")
                 return False
 
+            # Only open the camera while no recorder owns it; a recorder waits for us to release it
+            if self.frame_bus is not None and not self._bus_session:
+                if not self.frame_bus.open_session(self.camera_config.name):
+                    self.logger.info("Camera is owned by the recorder, not opening a streaming session")
+                    return False
+                self._bus_session = True
+
             # Initialize camera (suppress output to avoid MVCAMAPI error messages)
             with suppress_camera_errors():
                 self.hCamera = mvsdk.CameraInit(self.device_info, -1, -1)
@@ -188,11 +276,27 @@ class CameraStreamer:
             # Configure camera settings for streaming (optimized for preview)
             self._configure_streaming_settings()
 
+            # Bin/skip at the sensor for the preview, then size the frame buffer to what it delivers
+            width, height = self._configure_preview_resolution()
+
             # Allocate frame buffer
             bytes_per_pixel = 1 if self.monoCamera else 3
-            self.frame_buffer_size = self.cap.sResolutionRange.iWidthMax * self.cap.sResolutionRange.iHeightMax * bytes_per_pixel
+            self.frame_buffer_size = width * height * bytes_per_pixel
             self.frame_buffer = mvsdk.CameraAlignMalloc(self.frame_buffer_size, 16)
 
+            # Cache a numpy view over the SDK buffer once instead of rebuilding it every frame
+            self._np_buffer = np.frombuffer(memoryview((mvsdk.c_ubyte * self.frame_buffer_size).from_address(self.frame_buffer)), dtype=np.uint8)
+            self._frame_view = None
+            self._frame_view_size = None
+
+            # Use the GPU JPEG encoder for color previews when one is available
+            if NvJpeg is not None and not self.monoCamera and self._gpu_encoder is None:
+                try:
+                    self._gpu_encoder = NvJpeg()
+                    self.logger.info("Using NVJPEG for preview encoding")
+                except Exception as e:
+                    self.logger.info(f"NVJPEG not usable, encoding previews on the CPU: {e}")
+
             # Start camera
             mvsdk.CameraPlay(self.hCamera)
             self.logger.info("Camera started successfully for streaming")
@@ -204,6 +308,37 @@ class CameraStreamer:
             self._cleanup_camera()
             return False
 
+    def _configure_preview_resolution(self) -> tuple:
+        """Select the smallest full-field preset resolution still at least preview_max_width wide
+
+        Binned/skipped presets shrink the frame before it crosses the link and the ISP.
+        Returns the (width, height) the camera will deliver.
+        """
+        max_width = self.cap.sResolutionRange.iWidthMax
+        max_height = self.cap.sResolutionRange.iHeightMax
+        preview_max_width = self.camera_config.preview_max_width
+        if preview_max_width <= 0:
+            return max_width, max_height
+
+        best = None
+        for i in range(self.cap.iImageSizeDesc):
+            resolution = self.cap.pImageSizeDesc[i]
+            # Keep the whole field of view (no crop) and enough pixels for the preview
+            if resolution.iWidthFOV != max_width or resolution.iHeightFOV != max_height or resolution.iWidth < preview_max_width:
+                continue
+            if best is None or resolution.iWidth < best.iWidth:
+                best = resolution
+
+        if best is None or best.iWidth >= max_width:
+            return max_width, max_height
+
+        if mvsdk.CameraSetImageResolution(self.hCamera, best) != 0:
+            self.logger.warning(f"Could not select preview resolution {best.GetDescription()}, using full resolution")
+            return max_width, max_height
+
+        self.logger.info(f"Streaming at sensor resolution {best.iWidth}x{best.iHeight} ({best.GetDescription()})")
+        return best.iWidth, best.iHeight
+
     def _configure_streaming_settings(self):
         """Configure camera settings from config.json for streaming"""
         try:
@@ -242,76 +377,217 @@ class CameraStreamer:
             self.logger.warning(f"Could not configure some streaming settings: {e}")
 
     def _streaming_loop(self):
-        """Main streaming loop that captures frames continuously"""
+        """Main streaming loop that captures frames continuously, until streaming stops or a recorder takes the camera"""
         self.logger.info("Starting streaming loop")
+        self._pin_capture_thread()
 
         try:
-            while not self._stop_streaming_event.is_set():
+            # Frames arrive at the sensor rate; only those due at the preview rate are processed
+            next_deadline = time.monotonic()
+
+            # Pre-bind the per-frame SDK calls, handles and methods to locals
+            h_camera, frame_buffer = self.hCamera, self.frame_buffer
+            get_image_buffer = mvsdk.CameraGetImageBuffer
+            image_process = mvsdk.CameraImageProcess
+            release_image_buffer = mvsdk.CameraReleaseImageBuffer
+            stopping = self._stop_streaming_event.is_set
+            monotonic = time.monotonic
+            convert_frame = self._convert_frame_to_opencv
+            publish_frame = self._publish_frame
+            camera_name = self.camera_config.name
+            has_producer = self.frame_bus.has_producer if self.frame_bus is not None else None
+
+            while not stopping():
+                if has_producer is not None and has_producer(camera_name):
+                    break  # A recording is starting and waits for us to release the camera
+
                 try:
                     # Capture frame with timeout
-                    pRawData, FrameHead = mvsdk.CameraGetImageBuffer(self.hCamera, 200)  # 200ms timeout
+                    pRawData, FrameHead = get_image_buffer(h_camera, 200)  # 200ms timeout
+
+                    now = monotonic()
+                    if now < next_deadline:
+                        # Not due yet - hand the raw buffer straight back without running the ISP
+                        release_image_buffer(h_camera, pRawData)
+                        continue
+
+                    # Schedule the next frame on a fixed cadence, resynchronizing after a stall
+                    interval = 1.0 / self.preview_fps
+                    next_deadline += interval
+                    if next_deadline < now:
+                        next_deadline = now + interval
+
+                    try:
+                        # Process frame (mvsdk binds the SDK through ctypes.cdll, which drops the GIL for
+                        # the duration of the call, so the ISP overlaps with other Python threads)
+                        image_process(h_camera, pRawData, frame_buffer, FrameHead)
+
+                        # Convert to OpenCV format
+                        frame = convert_frame(FrameHead)
+
+                        if frame is not None:
+                            publish_frame(frame)
+                    finally:
+                        # Release buffer (even if processing or encoding failed)
+                        release_image_buffer(h_camera, pRawData)
 
-                    # Process frame
-                    mvsdk.CameraImageProcess(self.hCamera, pRawData, self.frame_buffer, FrameHead)
+                except Exception as e:
+                    if not self._stop_streaming_event.is_set():
+                        self._log_err("Error in streaming loop: %s", e)
+                        time.sleep(0.1)  # Brief pause before retrying
 
-                    # Convert to OpenCV format
-                    frame = self._convert_frame_to_opencv(FrameHead)
+        except Exception as e:
+            self.logger.error("Fatal error in streaming loop: %s", e)
+        finally:
+            self.logger.info("Streaming loop ended")
 
-                    if frame is not None:
-                        # Add frame to queue (replace oldest if queue is full)
-                        try:
-                            self._frame_queue.put_nowait(frame)
-                        except queue.Full:
-                            # Remove oldest frame and add new one
-                            try:
-                                self._frame_queue.get_nowait()
-                                self._frame_queue.put_nowait(frame)
-                            except queue.Empty:
-                                pass
+    def _pin_capture_thread(self) -> None:
+        """Pin the calling capture thread to the configured core (best effort, Linux only)
 
-                    # Release buffer
-                    mvsdk.CameraReleaseImageBuffer(self.hCamera, pRawData)
+        The thread keeps normal scheduling: it also resizes and encodes preview frames, and a
+        CPU-bound real-time thread would starve the MQTT, API and recorder threads.
+        """
+        if self.camera_config.pinned_core >= 0 and hasattr(os, "sched_setaffinity"):
+            try:
+                os.sched_setaffinity(0, {self.camera_config.pinned_core})
+            except OSError as e:
+                self.logger.warning(f"Could not pin streaming thread to core {self.camera_config.pinned_core}: {e}")
+
+    def _log_err(self, msg: str, *args) -> None:
+        """Log a hot-path error lazily, at most once per ERROR_LOG_INTERVAL seconds"""
+        now = time.monotonic()
+        if now - self._last_error_log < self.ERROR_LOG_INTERVAL:
+            self._suppressed_errors += 1
+            return
+
+        if self._suppressed_errors:
+            msg += " (%d similar errors suppressed)"
+            args += (self._suppressed_errors,)
+            self._suppressed_errors = 0
+        self._last_error_log = now
+        self.logger.error(msg, *args)
+
+    def _stream(self, use_frame_bus: bool) -> None:
+        """Streaming thread: run our own camera session, or preview the recorder's frames while it owns the camera"""
+        camera_name = self.camera_config.name
+        stopping = self._stop_streaming_event.is_set
+        while not stopping():
+            if not use_frame_bus:
+                self._streaming_loop()
+                if stopping():
+                    break
+
+                # A recording is starting; release the camera for it and preview its frames instead
+                self.logger.info("Recording started, switching preview to the recorder's frames")
+                self._cleanup_camera()
+                use_frame_bus = True
+                continue
+
+            self._preview_recorder_frames(camera_name)
+            if stopping():
+                break
+
+            # The recording ended while we were previewing it; carry on with our own camera session
+            if self._reopen_camera_after_recording(camera_name):
+                use_frame_bus = False
+            elif not stopping() and not self.frame_bus.has_producer(camera_name):
+                # Give up: report streaming as stopped and wake viewers blocked waiting for a frame
+                self.logger.error("Could not open camera for streaming after recording ended")
+                self._active.clear()
+                with self._frame_ready:
+                    self._frame_ready.notify_all()
+                break
+            # Otherwise a new recording took the camera while we were retrying; preview it
+
+    def _reopen_camera_after_recording(self, camera_name: str) -> bool:
+        """Open our own camera session once the recorder has released the camera, with bounded backoff
+
+        Returns False if streaming is stopped, a new recording takes the camera, or every attempt fails.
+        """
+        delay = self.REOPEN_DELAY
+        for attempt in range(1, self.REOPEN_ATTEMPTS + 1):
+            if self._stop_streaming_event.wait(delay) or self.frame_bus.has_producer(camera_name):
+                return False
+            if self._initialize_camera():
+                return True
+            self.logger.warning(f"Camera still busy after recording (attempt {attempt}/{self.REOPEN_ATTEMPTS})")
+            delay *= 2
+        return False
 
-                    # Control frame rate
-                    time.sleep(1.0 / self.preview_fps)
+    def _preview_recorder_frames(self, camera_name: str) -> None:
+        """Publish the recorder's frames until it detaches from the frame bus or streaming stops"""
+        self.logger.info("Starting streaming loop on recorder frames")
+        self.frame_bus.subscribe(camera_name, self.preview_fps)
 
-                except Exception as e:
-                    if not self._stop_streaming_event.is_set():
-                        self.logger.error(f"Error in streaming loop: {e}")
-                        time.sleep(0.1)  # Brief pause before retrying
+        try:
+            last_seq = -1
+            while not self._stop_streaming_event.is_set() and self.frame_bus.has_producer(camera_name):
+                entry = self.frame_bus.wait_for_frame(camera_name, last_seq, 0.5)
+                if entry is not None:
+                    last_seq, frame = entry
+                    self._publish_frame(frame)
 
         except Exception as e:
-            self.logger.error(f"Fatal error in streaming loop: {e}")
+            self.logger.error("Error in shared-frame streaming loop: %s", e)
         finally:
-            self.logger.info("Streaming loop ended")
+            self.frame_bus.unsubscribe(camera_name)
+
+    def _publish_frame(self, frame: np.ndarray) -> None:
+        """Encode a frame once (rather than once per viewer) and publish it to stream consumers"""
+        want_jpeg = self._jpeg_viewers > 0 or time.monotonic() < self._jpeg_wanted_until
+        want_pnm = self._raw_viewers > 0
+        if not (want_jpeg or want_pnm):
+            return  # Nobody is watching - skip the resize and encode
+
+        # Viewers rarely need full sensor resolution, and encode cost and bandwidth scale with area
+        height, width = frame.shape[:2]
+        max_width = self.camera_config.preview_max_width
+        if 0 < max_width < width:
+            scale = max_width / width
+            frame = cv2.resize(frame, (max_width, max(1, int(height * scale))), interpolation=cv2.INTER_AREA)
+
+        frame_bytes = self._encode_jpeg(frame) if want_jpeg else None
+        pnm_bytes = self._encode_pnm(frame) if want_pnm else None
+        # Recorder frames are always BGR, even from a mono camera, so go by the frame itself
+        pnm_type = b"image/x-portable-graymap" if frame.ndim == 2 else b"image/x-portable-pixmap"
+        with self._frame_ready:
+            self._latest_jpeg = frame_bytes
+            self._latest_pnm = pnm_bytes
+            self._latest_pnm_type = pnm_type
+            self._frame_seq += 1
+            self._frame_ready.notify_all()
 
     def _convert_frame_to_opencv(self, FrameHead) -> Optional[np.ndarray]:
-        """Convert camera frame to OpenCV format"""
+        """Convert camera frame to OpenCV format (BGR for color cameras, single-channel for mono)"""
         try:
-            # Convert the frame buffer memory address to a proper buffer
-            # that numpy can work with using mvsdk.c_ubyte
-            frame_data_buffer = (mvsdk.c_ubyte * FrameHead.uBytes).from_address(self.frame_buffer)
-
-            if self.monoCamera:
-                # Monochrome camera
-                frame_data = np.frombuffer(frame_data_buffer, dtype=np.uint8)
-                frame = frame_data.reshape((FrameHead.iHeight, FrameHead.iWidth))
-                # Convert to 3-channel for consistency
-                frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
-            else:
-                # Color camera (BGR format)
-                frame_data = np.frombuffer(frame_data_buffer, dtype=np.uint8)
-                frame = frame_data.reshape((FrameHead.iHeight, FrameHead.iWidth, 3))
+            # The frame size only changes with the camera resolution, so the shaped view over
+            # the SDK buffer is built once and reused instead of sliced and reshaped per frame
+            size = (FrameHead.iWidth, FrameHead.iHeight)
+            if size != self._frame_view_size:
+                width, height = size
+                if self.monoCamera:
+                    # Monochrome camera - kept single-channel, the JPEG encoder takes grayscale directly
+                    self._frame_view = self._np_buffer[: width * height].reshape((height, width))
+                else:
+                    # Color camera (BGR format)
+                    self._frame_view = self._np_buffer[: width * height * 3].reshape((height, width, 3))
+                self._frame_view_size = size
 
-            return frame
+            # Zero-copy view: only valid until the next CameraImageProcess, which is fine
+            # because the streaming thread encodes it before processing another frame
+            return self._frame_view
 
         except Exception as e:
-            self.logger.error(f"Error converting frame: {e}")
+            self._log_err("Error converting frame: %s", e)
             return None
 
     def _cleanup_camera(self):
         """Clean up camera resources"""
         try:
+            # Drop the views before freeing the memory they point into
+            self._np_buffer = None
+            self._frame_view = None
+            self._frame_view_size = None
             if self.frame_buffer:
                 mvsdk.CameraAlignFree(self.frame_buffer)
                 self.frame_buffer = None
@@ -324,10 +600,15 @@ class CameraStreamer:
 
         except Exception as e:
             self.logger.error(f"Error cleaning up camera resources: {e}")
+        finally:
+            # Hand the camera to a waiting recorder even if the cleanup failed
+            if self._bus_session:
+                self._bus_session = False
+                self.frame_bus.close_session(self.camera_config.name)
 
     def is_streaming(self) -> bool:
         """Check if streaming is active"""
-        return self.streaming
+        return self._active.is_set()
 
     def _configure_image_quality(self) -> None:
         """Configure image quality settings"""
@@ -408,5 +689,5 @@ class CameraStreamer:
 
     def __del__(self):
         """Destructor to ensure cleanup"""
-        if self.streaming:
+        if self._active.is_set():
             self.stop_streaming()
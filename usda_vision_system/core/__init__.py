@@ -11,5 +11,6 @@ __author__ = "USDA Vision Team"
 from .config import Config
 from .state_manager import StateManager
 from .events import EventSystem
+from .frame_bus import FrameBus
 
-__all__ = ["Config", "StateManager", "EventSystem"]
+__all__ = ["Config", "StateManager", "EventSystem", "FrameBus"]
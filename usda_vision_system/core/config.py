@@ -8,12 +8,40 @@ camera configurations, storage paths, and system parameters.
 import os
 import json
 import logging
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+import functools
+from typing import Dict, List, Optional, Any, Set, Tuple
+from dataclasses import dataclass, fields
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib json module is used without it
+    orjson = None
 
-@dataclass
+logger = logging.getLogger(__name__)
+
+# Parsed config files keyed by resolved path: (mtime_ns, size, parsed data)
+_CONFIG_CACHE: Dict[str, Tuple[int, int, Dict[str, Any]]] = {}
+
+
+def _read_config_file(config_path: Path) -> Dict[str, Any]:
+    """Parse a config file, reusing the previous parse while the file is unchanged on disk
+
+    The returned dict is shared with later callers and must not be mutated.
+    """
+    key = str(config_path.resolve())
+    stat = config_path.stat()
+    cached = _CONFIG_CACHE.get(key)
+    if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+
+    raw_config = config_path.read_bytes()
+    config_data = orjson.loads(raw_config) if orjson is not None else json.loads(raw_config)
+    _CONFIG_CACHE[key] = (stat.st_mtime_ns, stat.st_size, config_data)
+    return config_data
+
+
+@dataclass(slots=True)
 class MQTTConfig:
     """MQTT broker configuration"""
 
@@ -28,7 +56,7 @@ class MQTTConfig:
             self.topics = {"vibratory_conveyor": "vision/vibratory_conveyor/state", "blower_separator": "vision/blower_separator/state"}
 
 
-@dataclass
+@dataclass(slots=True)
 class CameraConfig:
     """Individual camera configuration"""
 
@@ -41,7 +69,7 @@ class CameraConfig:
     enabled: bool = True
 
     # Video recording settings
-    video_format: str = "mp4"  # Video file format (mp4, avi)
+    video_format: str = "mp4"  # Video file format (mp4, avi, raw = uncompressed BGR frames)
     video_codec: str = "mp4v"  # Video codec (mp4v for MP4, XVID for AVI)
     video_quality: int = 95  # Video quality (0-100, higher is better)
 
@@ -80,8 +108,14 @@ class CameraConfig:
     hdr_enabled: bool = False  # Enable High Dynamic Range
     hdr_gain_mode: int = 0  # HDR processing mode
 
+    # Capture Thread Scheduling
+    pinned_core: int = -1  # CPU core for this camera's streaming capture thread (-1 = no pinning)
+
+    # Live Preview
+    preview_max_width: int = 800  # Wider preview frames are downscaled before encoding (0 = full resolution)
+
 
-@dataclass
+@dataclass(slots=True)
 class StorageConfig:
     """Storage configuration"""
 
@@ -91,7 +125,7 @@ class StorageConfig:
     cleanup_older_than_days: int = 30  # Auto cleanup old files
 
 
-@dataclass
+@dataclass(slots=True)
 class SystemConfig:
     """System-wide configuration"""
 
@@ -107,12 +141,35 @@ class SystemConfig:
     auto_recording_enabled: bool = True  # Global enable/disable for auto-recording feature  # Atlanta, Georgia timezone
 
 
+@functools.lru_cache(maxsize=None)
+def _field_names(config_class: type) -> Tuple[str, ...]:
+    """Field names of a config dataclass, looked up once per class"""
+    return tuple(f.name for f in fields(config_class))
+
+
+def _config_to_dict(config: Any) -> Dict[str, Any]:
+    """Convert a config dataclass to a dict
+
+    Config dataclasses only hold scalars and flat string dicts, so unlike asdict() this does
+    not recurse or deep-copy; dict fields are copied shallowly so callers can't mutate them.
+    """
+    data = {name: getattr(config, name) for name in _field_names(type(config))}
+    for name, value in data.items():
+        if isinstance(value, dict):
+            data[name] = dict(value)
+    return data
+
+
 class Config:
     """Main configuration manager"""
 
+    __slots__ = ("config_file", "mqtt", "storage", "system", "cameras", "_cameras_by_name", "_cameras_by_topic", "_cached_dict", "_static_dicts")
+
+    # Storage directories already created/verified by this process, shared by all instances
+    _verified_dirs: Set[str] = set()
+
     def __init__(self, config_file: Optional[str] = None):
         self.config_file = config_file or "config.json"
-        self.logger = logging.getLogger(__name__)
 
         # Default configurations
         self.mqtt = MQTTConfig()
@@ -121,6 +178,11 @@ class Config:
 
         # Camera configurations - will be populated from config file or defaults
         self.cameras: List[CameraConfig] = []
+        self._cameras_by_name: Dict[str, CameraConfig] = {}
+        self._cameras_by_topic: Dict[str, CameraConfig] = {}
+        self._cached_dict: Optional[Dict[str, Any]] = None  # to_dict() result, reset whenever the config changes
+        # (mqtt, storage, system, their dicts): these sections are only replaced on load, never edited
+        self._static_dicts: Optional[Tuple[MQTTConfig, StorageConfig, SystemConfig, Dict[str, Any]]] = None
 
         # Load configuration
         self.load_config()
@@ -134,13 +196,14 @@ class Config:
 
         if config_path.exists():
             try:
-                with open(config_path, "r") as f:
-                    config_data = json.load(f)
+                config_data = _read_config_file(config_path)
 
                 # Load MQTT config
                 if "mqtt" in config_data:
                     mqtt_data = config_data["mqtt"]
                     self.mqtt = MQTTConfig(**mqtt_data)
+                    if self.mqtt.topics is not None:
+                        self.mqtt.topics = dict(self.mqtt.topics)  # Don't share with the parse cache
 
                 # Load storage config
                 if "storage" in config_data:
@@ -156,78 +219,102 @@ class Config:
                 if "cameras" in config_data:
                     self.cameras = []
                     for cam_data in config_data["cameras"]:
-                        # Set defaults for new video format fields if not present
-                        cam_data.setdefault("video_format", "mp4")
-                        cam_data.setdefault("video_codec", "mp4v")
-                        cam_data.setdefault("video_quality", 95)
+                        # Fields missing from older config files take the CameraConfig defaults
                         self.cameras.append(CameraConfig(**cam_data))
                 else:
                     self._create_default_camera_configs()
 
-                self.logger.info(f"Configuration loaded from {config_path}")
+                logger.info("Configuration loaded from %s", config_path)
 
             except Exception as e:
-                self.logger.error(f"Error loading config from {config_path}: {e}")
+                logger.error("Error loading config from %s: %s", config_path, e)
                 self._create_default_camera_configs()
         else:
-            self.logger.info(f"Config file {config_path} not found, using defaults")
+            logger.info("Config file %s not found, using defaults", config_path)
             self._create_default_camera_configs()
             self.save_config()  # Save default config
 
+        self._rebuild_camera_indexes()
+        self._cached_dict = None
+
     def _create_default_camera_configs(self) -> None:
         """Create default camera configurations"""
         self.cameras = [CameraConfig(name="camera1", machine_topic="vibratory_conveyor", storage_path=os.path.join(self.storage.base_path, "camera1")), CameraConfig(name="camera2", machine_topic="blower_separator", storage_path=os.path.join(self.storage.base_path, "camera2"))]
 
     def save_config(self) -> None:
         """Save current configuration to file"""
-        config_data = {"mqtt": asdict(self.mqtt), "storage": asdict(self.storage), "system": asdict(self.system), "cameras": [asdict(cam) for cam in self.cameras]}
-
+        self._cached_dict = None  # Callers mutate config objects in place before saving
         try:
-            with open(self.config_file, "w") as f:
-                json.dump(config_data, f, indent=2)
-            self.logger.info(f"Configuration saved to {self.config_file}")
+            if orjson is not None:
+                # orjson serializes the dataclasses natively, without asdict() deep copies
+                config_data = {"mqtt": self.mqtt, "storage": self.storage, "system": self.system, "cameras": self.cameras}
+                Path(self.config_file).write_bytes(orjson.dumps(config_data, option=orjson.OPT_INDENT_2))
+            else:
+                config_data = self.to_dict()
+                with open(self.config_file, "w") as f:
+                    json.dump(config_data, f, indent=2)
+            _CONFIG_CACHE.pop(str(Path(self.config_file).resolve()), None)
+            logger.info("Configuration saved to %s", self.config_file)
         except Exception as e:
-            self.logger.error(f"Error saving config to {self.config_file}: {e}")
+            logger.error("Error saving config to %s: %s", self.config_file, e)
 
     def _ensure_storage_directories(self) -> None:
         """Ensure all storage directories exist"""
         try:
-            # Create base storage directory
-            Path(self.storage.base_path).mkdir(parents=True, exist_ok=True)
-
-            # Create camera-specific directories
-            for camera in self.cameras:
-                Path(camera.storage_path).mkdir(parents=True, exist_ok=True)
-
-            self.logger.info("Storage directories verified/created")
+            # Create the base storage directory and camera-specific directories, skipping
+            # the mkdir syscall for paths already verified in this process
+            verified = Config._verified_dirs
+            for path in (self.storage.base_path, *(camera.storage_path for camera in self.cameras)):
+                if path not in verified:
+                    Path(path).mkdir(parents=True, exist_ok=True)
+                    verified.add(path)
+
+            logger.info("Storage directories verified/created")
         except Exception as e:
-            self.logger.error(f"Error creating storage directories: {e}")
+            logger.error("Error creating storage directories: %s", e)
+
+    def _rebuild_camera_indexes(self) -> None:
+        """Index cameras by name and MQTT topic (the first camera wins on duplicates, as with a list scan)"""
+        self._cameras_by_name = {}
+        self._cameras_by_topic = {}
+        for camera in self.cameras:
+            self._cameras_by_name.setdefault(camera.name, camera)
+            self._cameras_by_topic.setdefault(camera.machine_topic, camera)
 
     def get_camera_by_topic(self, topic: str) -> Optional[CameraConfig]:
         """Get camera configuration by MQTT topic"""
-        for camera in self.cameras:
-            if camera.machine_topic == topic:
-                return camera
-        return None
+        return self._cameras_by_topic.get(topic)
 
     def get_camera_by_name(self, name: str) -> Optional[CameraConfig]:
         """Get camera configuration by name"""
-        for camera in self.cameras:
-            if camera.name == name:
-                return camera
-        return None
+        return self._cameras_by_name.get(name)
 
     def update_camera_config(self, name: str, **kwargs) -> bool:
         """Update camera configuration"""
         camera = self.get_camera_by_name(name)
         if camera:
             for key, value in kwargs.items():
-                if hasattr(camera, key):
+                # CameraConfig is slotted, so unknown fields raise instead of being added
+                try:
                     setattr(camera, key, value)
+                except AttributeError:
+                    logger.warning("Ignoring unknown camera config field: %s", key)
+            if "name" in kwargs or "machine_topic" in kwargs:
+                self._rebuild_camera_indexes()
+            self._cached_dict = None
             self.save_config()
             return True
         return False
 
     def to_dict(self) -> Dict[str, Any]:
-        """Convert configuration to dictionary"""
-        return {"mqtt": asdict(self.mqtt), "storage": asdict(self.storage), "system": asdict(self.system), "cameras": [asdict(cam) for cam in self.cameras]}
+        """Convert configuration to dictionary
+
+        The result is cached until the configuration is reloaded, updated through
+        update_camera_config() or saved; treat it as read-only.
+        """
+        if self._cached_dict is None:
+            static = self._static_dicts
+            if static is None or static[0] is not self.mqtt or static[1] is not self.storage or static[2] is not self.system:
+                static = self._static_dicts = (self.mqtt, self.storage, self.system, {"mqtt": _config_to_dict(self.mqtt), "storage": _config_to_dict(self.storage), "system": _config_to_dict(self.system)})
+            self._cached_dict = {**static[3], "cameras": [_config_to_dict(cam) for cam in self.cameras]}
+        return self._cached_dict
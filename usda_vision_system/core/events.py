@@ -7,11 +7,16 @@ different components of the system (MQTT, cameras, recording, etc.).
 
 import threading
 import logging
-from typing import Dict, List, Callable, Any, Optional
-from dataclasses import dataclass
+import time
+import types
+from collections import deque
+from typing import Dict, List, Callable, Any, Mapping, Optional, Tuple
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 
+logger = logging.getLogger(__name__)
+
 
 class EventType(Enum):
     """Event types for the system"""
@@ -25,106 +30,109 @@ class EventType(Enum):
     SYSTEM_SHUTDOWN = "system_shutdown"
 
 
-@dataclass
+# Shared read-only data for events published without any
+_EMPTY_DATA: Mapping[str, Any] = types.MappingProxyType({})
+
+
+@dataclass(frozen=True, slots=True)
 class Event:
     """Event data structure"""
     event_type: EventType
     source: str
-    data: Dict[str, Any]
-    timestamp: datetime
-    
-    def __post_init__(self):
-        if not isinstance(self.timestamp, datetime):
-            self.timestamp = datetime.now()
+    data: Mapping[str, Any]  # Read-only for subscribers; may be shared between events
+    timestamp_ns: int = field(default_factory=time.monotonic_ns)  # For ordering/intervals only
+    wall_time: float = field(default_factory=time.time)  # Epoch seconds, read when published so clock steps are honored
+
+    @property
+    def timestamp(self) -> datetime:
+        """Local wall-clock time the event was published"""
+        return datetime.fromtimestamp(self.wall_time)
 
 
 class EventSystem:
     """Thread-safe event system for inter-component communication"""
     
     def __init__(self):
-        self.logger = logging.getLogger(__name__)
-        self._subscribers: Dict[EventType, List[Callable]] = {}
-        self._lock = threading.RLock()
-        self._event_history: List[Event] = []
+        self._subscribers: Dict[EventType, Tuple[Callable, ...]] = {}  # Immutable, replaced on every change
+        # Separate locks so publishers appending history never contend with subscriber management;
+        # the two are never held together
+        self._subs_lock = threading.RLock()
+        self._hist_lock = threading.RLock()
         self._max_history = 1000  # Keep last 1000 events
+        self._event_history: deque = deque(maxlen=self._max_history)  # Oldest events drop off in O(1)
+        self._history_by_type: Dict[EventType, deque] = {}  # Same cap, per type, for filtered queries
     
     def subscribe(self, event_type: EventType, callback: Callable[[Event], None]) -> None:
         """Subscribe to an event type"""
-        with self._lock:
-            if event_type not in self._subscribers:
-                self._subscribers[event_type] = []
-            
-            if callback not in self._subscribers[event_type]:
-                self._subscribers[event_type].append(callback)
-                self.logger.debug(f"Subscribed to {event_type.value}")
+        with self._subs_lock:
+            current = self._subscribers.get(event_type, ())
+            if callback not in current:
+                self._subscribers[event_type] = current + (callback,)
+                logger.debug("Subscribed to %s", event_type.value)
     
     def unsubscribe(self, event_type: EventType, callback: Callable[[Event], None]) -> None:
         """Unsubscribe from an event type"""
-        with self._lock:
-            if event_type in self._subscribers:
-                try:
-                    self._subscribers[event_type].remove(callback)
-                    self.logger.debug(f"Unsubscribed from {event_type.value}")
-                except ValueError:
-                    pass  # Callback wasn't subscribed
+        with self._subs_lock:
+            current = self._subscribers.get(event_type, ())
+            if callback in current:
+                self._subscribers[event_type] = tuple(cb for cb in current if cb != callback)
+                logger.debug("Unsubscribed from %s", event_type.value)
     
-    def publish(self, event_type: EventType, source: str, data: Optional[Dict[str, Any]] = None) -> None:
+    def publish(self, event_type: EventType, source: str, data: Optional[Mapping[str, Any]] = None) -> None:
         """Publish an event"""
-        if data is None:
-            data = {}
-        
         event = Event(
             event_type=event_type,
             source=source,
-            data=data,
-            timestamp=datetime.now()
+            data=_EMPTY_DATA if data is None else data
         )
         
         # Add to history
-        with self._lock:
+        with self._hist_lock:
             self._event_history.append(event)
-            if len(self._event_history) > self._max_history:
-                self._event_history.pop(0)
+            type_history = self._history_by_type.get(event_type)
+            if type_history is None:
+                type_history = self._history_by_type[event_type] = deque(maxlen=self._max_history)
+            type_history.append(event)
         
-        # Notify subscribers
-        self._notify_subscribers(event)
+        # Notify subscribers; the tuple is never mutated in place, so it can be read without the lock
+        subscribers = self._subscribers.get(event_type)
+        if subscribers:
+            self._notify_subscribers(event, subscribers)
     
-    def _notify_subscribers(self, event: Event) -> None:
+    def _notify_subscribers(self, event: Event, subscribers: Tuple[Callable, ...]) -> None:
         """Notify all subscribers of an event"""
-        with self._lock:
-            subscribers = self._subscribers.get(event.event_type, []).copy()
-        
         for callback in subscribers:
             try:
                 callback(event)
             except Exception as e:
-                self.logger.error(f"Error in event callback for {event.event_type.value}: {e}")
+                logger.error("Error in event callback for %s: %s", event.event_type.value, e)
     
     def get_recent_events(self, event_type: Optional[EventType] = None, limit: int = 100) -> List[Event]:
         """Get recent events, optionally filtered by type"""
-        with self._lock:
-            events = self._event_history.copy()
-        
-        if event_type:
-            events = [e for e in events if e.event_type == event_type]
+        with self._hist_lock:
+            if event_type:
+                events = list(self._history_by_type.get(event_type, ()))
+            else:
+                events = list(self._event_history)
         
         return events[-limit:] if limit else events
     
     def clear_history(self) -> None:
         """Clear event history"""
-        with self._lock:
+        with self._hist_lock:
             self._event_history.clear()
-            self.logger.info("Event history cleared")
+            self._history_by_type.clear()
+            logger.info("Event history cleared")
     
     def get_subscriber_count(self, event_type: EventType) -> int:
         """Get number of subscribers for an event type"""
-        with self._lock:
-            return len(self._subscribers.get(event_type, []))
+        with self._subs_lock:
+            return len(self._subscribers.get(event_type, ()))
     
     def get_all_event_types(self) -> List[EventType]:
         """Get all event types that have subscribers"""
-        with self._lock:
-            return list(self._subscribers.keys())
+        with self._subs_lock:
+            return [event_type for event_type, subscribers in self._subscribers.items() if subscribers]
 
 
 # Global event system instance
@@ -0,0 +1,122 @@
+"""
+Frame bus for the USDA Vision Camera System.
+
+This module lets the component that currently owns a camera session (the recorder
+while it is recording) share its processed frames with other consumers such as the
+live preview streamer, so a camera is never opened and processed twice.
+"""
+
+import threading
+import time
+import logging
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+if TYPE_CHECKING:  # numpy is only needed for annotations; keep it out of every core import
+    import numpy as np
+
+
+class FrameBus:
+    """Fans out the latest processed frame of each camera from its producer to consumers"""
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self._cond = threading.Condition(threading.Lock())
+        self._producers: Dict[str, int] = {}  # camera_name -> attached producer count
+        self._sessions: Dict[str, int] = {}  # camera_name -> consumers running their own camera session
+        self._consumers: Dict[str, int] = {}  # camera_name -> subscribed consumer count
+        self._intervals: Dict[str, float] = {}  # camera_name -> shortest interval any consumer asked for
+        self._next_due: Dict[str, float] = {}  # camera_name -> monotonic time the next frame is wanted
+        self._frames: Dict[str, Tuple[int, "np.ndarray"]] = {}  # camera_name -> (sequence, frame)
+        self._seq = 0  # Bus-wide so sequences never repeat across producer sessions
+
+    def attach_producer(self, camera_name: str) -> None:
+        """Register a producer that is taking over a camera; consumers close their own sessions on it"""
+        with self._cond:
+            self._producers[camera_name] = self._producers.get(camera_name, 0) + 1
+            self._cond.notify_all()
+        self.logger.debug(f"Frame producer attached for camera: {camera_name}")
+
+    def detach_producer(self, camera_name: str) -> None:
+        """Unregister a producer, waking consumers so they can fall back to their own session"""
+        with self._cond:
+            count = self._producers.get(camera_name, 0) - 1
+            if count > 0:
+                self._producers[camera_name] = count
+            else:
+                self._producers.pop(camera_name, None)
+                self._frames.pop(camera_name, None)
+            self._cond.notify_all()
+        self.logger.debug(f"Frame producer detached for camera: {camera_name}")
+
+    def has_producer(self, camera_name: str) -> bool:
+        """Check if a producer is currently publishing frames for a camera"""
+        return camera_name in self._producers
+
+    def open_session(self, camera_name: str) -> bool:
+        """Register a consumer opening its own camera session; refused while a producer owns the camera"""
+        with self._cond:
+            if camera_name in self._producers:
+                return False
+            self._sessions[camera_name] = self._sessions.get(camera_name, 0) + 1
+            return True
+
+    def close_session(self, camera_name: str) -> None:
+        """Unregister a consumer's own camera session, waking producers waiting for the camera"""
+        with self._cond:
+            count = self._sessions.get(camera_name, 0) - 1
+            if count > 0:
+                self._sessions[camera_name] = count
+            else:
+                self._sessions.pop(camera_name, None)
+            self._cond.notify_all()
+
+    def wait_for_sessions_closed(self, camera_name: str, timeout: float) -> bool:
+        """Wait until no consumer holds its own session on a camera; returns False on timeout"""
+        with self._cond:
+            return self._cond.wait_for(lambda: camera_name not in self._sessions, timeout)
+
+    def subscribe(self, camera_name: str, max_fps: float) -> None:
+        """Register a consumer that wants frames for a camera at up to max_fps"""
+        with self._cond:
+            self._consumers[camera_name] = self._consumers.get(camera_name, 0) + 1
+            interval = 1.0 / max_fps
+            self._intervals[camera_name] = min(interval, self._intervals.get(camera_name, interval))
+            self._next_due[camera_name] = 0.0
+
+    def unsubscribe(self, camera_name: str) -> None:
+        """Unregister a consumer"""
+        with self._cond:
+            count = self._consumers.get(camera_name, 0) - 1
+            if count > 0:
+                self._consumers[camera_name] = count
+            else:
+                self._consumers.pop(camera_name, None)
+                self._intervals.pop(camera_name, None)
+                self._next_due.pop(camera_name, None)
+
+    def frame_due(self, camera_name: str) -> bool:
+        """Check (without locking) whether a consumer wants the next frame for a camera"""
+        next_due = self._next_due.get(camera_name)
+        return next_due is not None and time.monotonic() >= next_due
+
+    def publish(self, camera_name: str, frame: "np.ndarray") -> None:
+        """Publish a copy of a processed frame; the caller keeps ownership of frame"""
+        frame = frame.copy()
+        now = time.monotonic()
+        with self._cond:
+            interval = self._intervals.get(camera_name)
+            if interval is None:
+                return  # Last consumer left since frame_due()
+            self._next_due[camera_name] = now + interval
+            self._seq += 1
+            self._frames[camera_name] = (self._seq, frame)
+            self._cond.notify_all()
+
+    def wait_for_frame(self, camera_name: str, last_seq: int, timeout: float) -> Optional[Tuple[int, "np.ndarray"]]:
+        """Wait for a frame newer than last_seq; returns None on timeout or when the producer detaches"""
+        with self._cond:
+            self._cond.wait_for(lambda: camera_name not in self._producers or self._frames.get(camera_name, (last_seq,))[0] != last_seq, timeout)
+            entry = self._frames.get(camera_name)
+            if entry is None or entry[0] == last_seq:
+                return None
+            return entry
@@ -5,10 +5,15 @@ This module provides comprehensive logging setup with rotation, formatting,
 and different log levels for different components.
 """
 
+import atexit
+import itertools
 import logging
 import logging.handlers
 import os
+import queue
 import sys
+import threading
+import time
 from typing import Optional
 from datetime import datetime
 
@@ -26,12 +31,111 @@ class ColoredFormatter(logging.Formatter):
         'RESET': '\033[0m'      # Reset
     }
     
+    # Colored level names, built once instead of per record (filled in below the class)
+    _PRECOLORED: dict = {}
+    
     def format(self, record):
-        # Add color to levelname
-        if record.levelname in self.COLORS:
-            record.levelname = f"{self.COLORS[record.levelname]}{record.levelname}{self.COLORS['RESET']}"
-        
-        return super().format(record)
+        # Color the levelname only while formatting, so other handlers see the plain name
+        levelname = record.levelname
+        record.levelname = self._PRECOLORED.get(levelname, levelname)
+        try:
+            return super().format(record)
+        finally:
+            record.levelname = levelname
+
+
+ColoredFormatter._PRECOLORED = {
+    level: f"{color}{level}{ColoredFormatter.COLORS['RESET']}" for level, color in ColoredFormatter.COLORS.items() if level != 'RESET'
+}
+
+
+class FastRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """RotatingFileHandler that only checks the file size every few records
+
+    The stock shouldRollover() formats the record and seeks to the end of the file on every
+    emit. Checking every check_interval records instead can let the file grow past maxBytes by
+    at most that many records.
+    """
+    
+    def __init__(self, *args, check_interval: int = 100, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.check_interval = check_interval
+        self._records_since_check = 0
+    
+    def shouldRollover(self, record):
+        self._records_since_check += 1
+        if self._records_since_check < self.check_interval:
+            return False
+        self._records_since_check = 0
+        return super().shouldRollover(record)
+
+
+class BatchingRotatingFileHandler(FastRotatingFileHandler):
+    """Rotating file handler that buffers formatted records and writes them in batches
+
+    The buffer is written with a single writelines() once it holds flush_bytes, when an ERROR
+    or higher record arrives, and at least every flush_interval seconds while idle.
+    """
+    
+    def __init__(self, *args, flush_bytes: int = 64 * 1024, flush_interval: float = 5.0, **kwargs):
+        self._buf = []
+        self._buf_bytes = 0
+        super().__init__(*args, **kwargs)
+        self.flush_bytes = flush_bytes
+        self._stop_flusher = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_periodically, args=(flush_interval,), daemon=True, name="log-flusher")
+        self._flusher.start()
+    
+    def shouldRollover(self, record):
+        if self._records_since_check + 1 >= self.check_interval:
+            self._write_buffer()  # The size check only sees what has reached the file
+        return super().shouldRollover(record)
+    
+    def emit(self, record):
+        try:
+            if self.shouldRollover(record):
+                self.doRollover()
+            msg = self.format(record) + self.terminator
+            self._buf.append(msg)
+            self._buf_bytes += len(msg)
+            if record.levelno >= logging.ERROR or self._buf_bytes >= self.flush_bytes:
+                self._write_buffer()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+    
+    def _write_buffer(self):
+        """Write out buffered records (must hold the handler lock)"""
+        if not self._buf:
+            return
+        if self.stream is None:
+            self.stream = self._open()
+        self.stream.writelines(self._buf)
+        self.stream.flush()
+        self._buf.clear()
+        self._buf_bytes = 0
+    
+    def flush(self):
+        self.acquire()
+        try:
+            self._write_buffer()
+        finally:
+            self.release()
+        super().flush()
+    
+    def close(self):
+        self._stop_flusher.set()
+        self.flush()
+        super().close()
+    
+    def _flush_periodically(self, interval: float):
+        """Background loop that writes out buffered records while logging is idle"""
+        while not self._stop_flusher.wait(interval):
+            try:
+                self.flush()
+            except Exception:
+                pass  # The next emit or flush will retry
 
 
 class USDAVisionLogger:
@@ -43,6 +147,7 @@ class USDAVisionLogger:
         self.log_file = log_file
         self.enable_console = enable_console
         self.enable_rotation = enable_rotation
+        self._listener: Optional[logging.handlers.QueueListener] = None
         
         # Setup logging
         self._setup_logging()
@@ -57,6 +162,9 @@ class USDAVisionLogger:
         # Clear existing handlers
         root_logger.handlers.clear()
         
+        # Handlers that do real I/O; they run on a background listener thread, not on the caller's
+        handlers = []
+        
         # Create formatters
         detailed_formatter = logging.Formatter(
             '%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s'
@@ -75,7 +183,7 @@ class USDAVisionLogger:
             console_handler = logging.StreamHandler(sys.stdout)
             console_handler.setLevel(getattr(logging, self.log_level))
             console_handler.setFormatter(colored_formatter)
-            root_logger.addHandler(console_handler)
+            handlers.append(console_handler)
         
         # File handler
         if self.log_file:
@@ -87,7 +195,7 @@ class USDAVisionLogger:
                 
                 if self.enable_rotation:
                     # Rotating file handler (10MB max, keep 5 backups)
-                    file_handler = logging.handlers.RotatingFileHandler(
+                    file_handler = BatchingRotatingFileHandler(
                         self.log_file,
                         maxBytes=10*1024*1024,  # 10MB
                         backupCount=5
@@ -97,11 +205,19 @@ class USDAVisionLogger:
                 
                 file_handler.setLevel(logging.DEBUG)  # File gets all messages
                 file_handler.setFormatter(detailed_formatter)
-                root_logger.addHandler(file_handler)
+                handlers.append(file_handler)
                 
             except Exception as e:
                 print(f"Warning: Could not setup file logging: {e}")
         
+        # Callers only enqueue records; writes, size checks and rotation happen on the listener thread
+        if handlers:
+            log_queue = queue.Queue(maxsize=100_000)
+            self._listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+            self._listener.start()
+            atexit.register(self.shutdown)  # Flush queued records on interpreter exit
+            root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        
         # Setup specific logger levels for different components
         self._setup_component_loggers()
         
@@ -141,6 +257,14 @@ class USDAVisionLogger:
         fastapi_logger = logging.getLogger('fastapi')
         fastapi_logger.setLevel(logging.WARNING)
     
+    def shutdown(self) -> None:
+        """Stop the background listener after writing out any queued records"""
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            listener.stop()
+            for handler in listener.handlers:
+                handler.close()
+    
     @staticmethod
     def setup_exception_logging():
         """Setup logging for uncaught exceptions"""
@@ -165,29 +289,30 @@ class PerformanceLogger:
     
     def __init__(self, name: str):
         self.logger = logging.getLogger(f"performance.{name}")
-        self.start_time: Optional[float] = None
+        self.start_time: Optional[int] = None  # time.perf_counter_ns() at start_timer
     
     def start_timer(self, operation: str) -> None:
         """Start timing an operation"""
-        import time
-        self.start_time = time.time()
-        self.logger.debug(f"Started: {operation}")
+        self.start_time = time.perf_counter_ns()
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Started: %s", operation)
     
     def end_timer(self, operation: str) -> float:
         """End timing an operation and log duration"""
-        import time
         if self.start_time is None:
-            self.logger.warning(f"Timer not started for: {operation}")
+            self.logger.warning("Timer not started for: %s", operation)
             return 0.0
         
-        duration = time.time() - self.start_time
-        self.logger.info(f"Completed: {operation} in {duration:.3f}s")
+        duration = (time.perf_counter_ns() - self.start_time) / 1e9
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("Completed: %s in %.3fs", operation, duration)
         self.start_time = None
         return duration
     
     def log_metric(self, metric_name: str, value: float, unit: str = "") -> None:
         """Log a performance metric"""
-        self.logger.info(f"Metric: {metric_name} = {value} {unit}")
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("Metric: %s = %s %s", metric_name, value, unit)
 
 
 class ErrorTracker:
@@ -197,39 +322,51 @@ class ErrorTracker:
         self.component_name = component_name
         self.logger = logging.getLogger(f"errors.{component_name}")
         self.error_count = 0
-        self.last_error_time: Optional[datetime] = None
+        self._error_counter = itertools.count(1)  # next() is a single C-level step, so concurrent errors are never lost
+        self._last_error_ts: Optional[float] = None  # POSIX seconds
+    
+    @property
+    def last_error_time(self) -> Optional[datetime]:
+        """Time of the most recent error"""
+        return datetime.fromtimestamp(self._last_error_ts) if self._last_error_ts is not None else None
     
     def log_error(self, error: Exception, context: str = "", 
                   additional_data: Optional[dict] = None) -> None:
         """Log an error with context and tracking"""
-        self.error_count += 1
-        self.last_error_time = datetime.now()
+        self.error_count = next(self._error_counter)
+        self._last_error_ts = time.time()
         
-        error_msg = f"Error in {self.component_name}"
+        if not self.logger.isEnabledFor(logging.ERROR):
+            return
+        
+        # Pass values as arguments so str(error) and the data repr are only built by the handler
         if context:
-            error_msg += f" ({context})"
-        error_msg += f": {str(error)}"
+            msg, args = "Error in %s (%s): %s", [self.component_name, context, error]
+        else:
+            msg, args = "Error in %s: %s", [self.component_name, error]
         
         if additional_data:
-            error_msg += f" | Data: {additional_data}"
+            msg += " | Data: %s"
+            args.append(additional_data)
         
-        self.logger.error(error_msg, exc_info=True)
+        self.logger.error(msg, *args, exc_info=True)
     
     def log_warning(self, message: str, context: str = "") -> None:
         """Log a warning with context"""
-        warning_msg = f"Warning in {self.component_name}"
-        if context:
-            warning_msg += f" ({context})"
-        warning_msg += f": {message}"
+        if not self.logger.isEnabledFor(logging.WARNING):
+            return
         
-        self.logger.warning(warning_msg)
+        if context:
+            self.logger.warning("Warning in %s (%s): %s", self.component_name, context, message)
+        else:
+            self.logger.warning("Warning in %s: %s", self.component_name, message)
     
     def get_error_stats(self) -> dict:
         """Get error statistics"""
         return {
             "component": self.component_name,
             "error_count": self.error_count,
-            "last_error_time": self.last_error_time.isoformat() if self.last_error_time else None
+            "last_error_time": datetime.fromtimestamp(self._last_error_ts).isoformat() if self._last_error_ts is not None else None
         }
 
 
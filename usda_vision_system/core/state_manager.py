@@ -7,7 +7,10 @@ in a thread-safe manner.
 
 import threading
 import logging
-from typing import Dict, Optional, List, Any
+import time
+from collections import deque
+from types import MappingProxyType
+from typing import Deque, Dict, Iterable, Mapping, Optional, List, Any, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
@@ -41,15 +44,44 @@ class RecordingState(Enum):
     ERROR = "error"
 
 
-@dataclass
+def _enum_lookup(enum_cls) -> Mapping[str, Any]:
+    """Map each enum value, plus its upper and capitalized spellings, to its member"""
+    table = {}
+    for member in enum_cls:
+        for key in (member.value, member.value.upper(), member.value.capitalize()):
+            table[key] = member
+    return MappingProxyType(table)
+
+
+# Exact-match lookups for the common spellings; anything else falls back to lower()
+_MACHINE_STATES = _enum_lookup(MachineState)
+_CAMERA_STATUSES = _enum_lookup(CameraStatus)
+
+
+@dataclass(slots=True)
 class MachineInfo:
     """Machine state information"""
 
     name: str
     state: MachineState = MachineState.UNKNOWN
-    last_updated: datetime = field(default_factory=datetime.now)
+    last_updated_ts: float = field(default_factory=time.time)  # POSIX seconds; converted on read
     last_message: Optional[str] = None
     mqtt_topic: Optional[str] = None
+    _iso_cache: Tuple[float, str] = field(default=(0.0, ""), init=False, repr=False, compare=False)  # (ts, isoformat)
+
+    @property
+    def last_updated(self) -> datetime:
+        return datetime.fromtimestamp(self.last_updated_ts)
+
+    @property
+    def last_updated_iso(self) -> str:
+        """last_updated as an ISO string, reformatted only when the timestamp changes"""
+        ts, iso = self._iso_cache
+        if ts != self.last_updated_ts:
+            ts = self.last_updated_ts
+            iso = datetime.fromtimestamp(ts).isoformat()
+            self._iso_cache = (ts, iso)
+        return iso
 
 
 @dataclass
@@ -64,13 +96,13 @@ class MQTTEvent:
     message_number: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class CameraInfo:
     """Camera state information"""
 
     name: str
     status: CameraStatus = CameraStatus.UNKNOWN
-    last_checked: datetime = field(default_factory=datetime.now)
+    last_checked_ts: float = field(default_factory=time.time)  # POSIX seconds; converted on read
     last_error: Optional[str] = None
     device_info: Optional[Dict[str, Any]] = None
     is_recording: bool = False
@@ -83,9 +115,24 @@ class CameraInfo:
     auto_recording_failure_count: int = 0
     auto_recording_last_attempt: Optional[datetime] = None
     auto_recording_last_error: Optional[str] = None
+    _iso_cache: Tuple[float, str] = field(default=(0.0, ""), init=False, repr=False, compare=False)  # (ts, isoformat)
 
+    @property
+    def last_checked(self) -> datetime:
+        return datetime.fromtimestamp(self.last_checked_ts)
 
-@dataclass
+    @property
+    def last_checked_iso(self) -> str:
+        """last_checked as an ISO string, reformatted only when the timestamp changes"""
+        ts, iso = self._iso_cache
+        if ts != self.last_checked_ts:
+            ts = self.last_checked_ts
+            iso = datetime.fromtimestamp(ts).isoformat()
+            self._iso_cache = (ts, iso)
+        return iso
+
+
+@dataclass(slots=True)
 class RecordingInfo:
     """Recording session information"""
 
@@ -97,6 +144,7 @@ class RecordingInfo:
     file_size_bytes: Optional[int] = None
     frame_count: Optional[int] = None
     error_message: Optional[str] = None
+    start_time_mono: float = field(default_factory=time.perf_counter, repr=False, compare=False)  # For durations
 
 
 class StateManager:
@@ -104,12 +152,18 @@ class StateManager:
 
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        self._lock = threading.RLock()
+        self._lock = threading.Lock()  # Serializes writers only; never re-entered
 
-        # State dictionaries
+        # State dictionaries. These are copy-on-write: entries are only added or removed by
+        # swapping in a new dict under the lock, so readers can use them without locking.
         self._machines: Dict[str, MachineInfo] = {}
         self._cameras: Dict[str, CameraInfo] = {}
         self._recordings: Dict[str, RecordingInfo] = {}  # Key: recording_id (filename)
+        # Read-only views of the current dicts returned by get_all_*, replaced along with them
+        self._machines_view: Mapping[str, MachineInfo] = MappingProxyType(self._machines)
+        self._cameras_view: Mapping[str, CameraInfo] = MappingProxyType(self._cameras)
+        self._recordings_view: Mapping[str, RecordingInfo] = MappingProxyType(self._recordings)
+        self._finished_recordings: Deque[Tuple[datetime, str]] = deque()  # (end_time, recording_id), oldest first
 
         # MQTT event history
         self._mqtt_events: List[MQTTEvent] = []
@@ -119,41 +173,57 @@ class StateManager:
         # System state
         self._mqtt_connected = False
         self._system_started = False
-        self._last_mqtt_message_time: Optional[datetime] = None
+        self._last_mqtt_message_ts: Optional[float] = None  # POSIX seconds
 
     # Machine state management
     def update_machine_state(self, name: str, state: str, message: Optional[str] = None, topic: Optional[str] = None) -> bool:
         """Update machine state"""
-        try:
-            machine_state = MachineState(state.lower())
-        except ValueError:
-            self.logger.warning(f"Invalid machine state: {state}")
-            machine_state = MachineState.UNKNOWN
+        machine_state = self._resolve_machine_state(state)
 
         with self._lock:
-            if name not in self._machines:
-                self._machines[name] = MachineInfo(name=name, mqtt_topic=topic)
+            return self._set_machine_state_unlocked(name, machine_state, message, topic, time.time())
 
-            machine = self._machines[name]
-            old_state = machine.state
-            machine.state = machine_state
-            machine.last_updated = datetime.now()
-            machine.last_message = message
-            if topic:
-                machine.mqtt_topic = topic
+    def update_machine_state_bulk(self, updates: Iterable[Tuple[str, str, Optional[str], Optional[str]]]) -> List[bool]:
+        """Apply (name, state, message, topic) updates in order under one lock acquisition; returns which changed state"""
+        resolved = [(name, self._resolve_machine_state(state), message, topic) for name, state, message, topic in updates]
 
-            self.logger.info(f"Machine {name} state: {old_state.value} -> {machine_state.value}")
-            return old_state != machine_state
+        now = time.time()
+        with self._lock:
+            return [self._set_machine_state_unlocked(name, machine_state, message, topic, now) for name, machine_state, message, topic in resolved]
+
+    def _resolve_machine_state(self, state: str) -> MachineState:
+        """Map a state string to a MachineState, falling back to UNKNOWN"""
+        machine_state = _MACHINE_STATES.get(state) or _MACHINE_STATES.get(state.lower())
+        if machine_state is None:
+            self.logger.warning(f"Invalid machine state: {state}")
+            machine_state = MachineState.UNKNOWN
+        return machine_state
+
+    def _set_machine_state_unlocked(self, name: str, machine_state: MachineState, message: Optional[str], topic: Optional[str], timestamp: float) -> bool:
+        """Set machine state (must hold the lock); returns whether the state changed"""
+        machine = self._machines.get(name)
+        if machine is None:
+            machine = MachineInfo(name=name, mqtt_topic=topic)
+            self._machines = {**self._machines, name: machine}
+            self._machines_view = MappingProxyType(self._machines)
+
+        old_state = machine.state
+        machine.state = machine_state
+        machine.last_updated_ts = timestamp
+        machine.last_message = message
+        if topic:
+            machine.mqtt_topic = topic
+
+        self.logger.info(f"Machine {name} state: {old_state.value} -> {machine_state.value}")
+        return old_state != machine_state
 
     def get_machine_state(self, name: str) -> Optional[MachineInfo]:
         """Get machine state"""
-        with self._lock:
-            return self._machines.get(name)
+        return self._machines.get(name)
 
-    def get_all_machines(self) -> Dict[str, MachineInfo]:
-        """Get all machine states"""
-        with self._lock:
-            return self._machines.copy()
+    def get_all_machines(self) -> Mapping[str, MachineInfo]:
+        """Get all machine states (a read-only snapshot)"""
+        return self._machines_view
 
     # MQTT event management
     def add_mqtt_event(self, machine_name: str, topic: str, payload: str, normalized_state: str) -> None:
@@ -171,6 +241,17 @@ class StateManager:
 
             self.logger.debug(f"Added MQTT event #{self._mqtt_event_counter}: {machine_name} -> {normalized_state}")
 
+    def add_mqtt_events_bulk(self, events: Iterable[Tuple[str, str, str, str]]) -> None:
+        """Add (machine_name, topic, payload, normalized_state) events to the history under one lock acquisition"""
+        timestamp = datetime.now()
+        with self._lock:
+            for machine_name, topic, payload, normalized_state in events:
+                self._mqtt_event_counter += 1
+                self._mqtt_events.append(MQTTEvent(machine_name=machine_name, topic=topic, payload=payload, normalized_state=normalized_state, timestamp=timestamp, message_number=self._mqtt_event_counter))
+
+            # Keep only the last N events
+            del self._mqtt_events[: -self._max_mqtt_events]
+
     def get_recent_mqtt_events(self, limit: int = 5) -> List[MQTTEvent]:
         """Get the most recent MQTT events"""
         with self._lock:
@@ -185,20 +266,16 @@ class StateManager:
     # Camera state management
     def update_camera_status(self, name: str, status: str, error: Optional[str] = None, device_info: Optional[Dict] = None) -> bool:
         """Update camera status"""
-        try:
-            camera_status = CameraStatus(status.lower())
-        except ValueError:
+        camera_status = _CAMERA_STATUSES.get(status) or _CAMERA_STATUSES.get(status.lower())
+        if camera_status is None:
             self.logger.warning(f"Invalid camera status: {status}")
             camera_status = CameraStatus.UNKNOWN
 
         with self._lock:
-            if name not in self._cameras:
-                self._cameras[name] = CameraInfo(name=name)
-
-            camera = self._cameras[name]
+            camera = self._get_or_add_camera(name)
             old_status = camera.status
             camera.status = camera_status
-            camera.last_checked = datetime.now()
+            camera.last_checked_ts = time.time()
             camera.last_error = error
             if device_info:
                 camera.device_info = device_info
@@ -211,29 +288,37 @@ class StateManager:
     def set_camera_recording(self, name: str, recording: bool, filename: Optional[str] = None) -> None:
         """Set camera recording state"""
         with self._lock:
-            if name not in self._cameras:
-                self._cameras[name] = CameraInfo(name=name)
-
-            camera = self._cameras[name]
-            camera.is_recording = recording
-            camera.current_recording_file = filename
-
-            if recording and filename:
-                camera.recording_start_time = datetime.now()
-                self.logger.info(f"Camera {name} started recording: {filename}")
-            elif not recording:
-                camera.recording_start_time = None
-                self.logger.info(f"Camera {name} stopped recording")
+            self._set_camera_recording_unlocked(name, recording, filename)
+
+    def _set_camera_recording_unlocked(self, name: str, recording: bool, filename: Optional[str] = None) -> None:
+        """Set camera recording state (must hold the lock)"""
+        camera = self._get_or_add_camera(name)
+        camera.is_recording = recording
+        camera.current_recording_file = filename
+
+        if recording and filename:
+            camera.recording_start_time = datetime.now()
+            self.logger.info(f"Camera {name} started recording: {filename}")
+        elif not recording:
+            camera.recording_start_time = None
+            self.logger.info(f"Camera {name} stopped recording")
+
+    def _get_or_add_camera(self, name: str) -> CameraInfo:
+        """Get a camera's info, adding it if unknown (must hold the lock)"""
+        camera = self._cameras.get(name)
+        if camera is None:
+            camera = CameraInfo(name=name)
+            self._cameras = {**self._cameras, name: camera}
+            self._cameras_view = MappingProxyType(self._cameras)
+        return camera
 
     def get_camera_status(self, name: str) -> Optional[CameraInfo]:
         """Get camera status"""
-        with self._lock:
-            return self._cameras.get(name)
+        return self._cameras.get(name)
 
-    def get_all_cameras(self) -> Dict[str, CameraInfo]:
-        """Get all camera statuses"""
-        with self._lock:
-            return self._cameras.copy()
+    def get_all_cameras(self) -> Mapping[str, CameraInfo]:
+        """Get all camera statuses (a read-only snapshot)"""
+        return self._cameras_view
 
     # Recording management
     def start_recording(self, camera_name: str, filename: str) -> str:
@@ -242,10 +327,11 @@ class StateManager:
 
         with self._lock:
             recording = RecordingInfo(camera_name=camera_name, filename=filename, start_time=datetime.now())
-            self._recordings[recording_id] = recording
+            self._recordings = {**self._recordings, recording_id: recording}
+            self._recordings_view = MappingProxyType(self._recordings)
 
             # Update camera state
-            self.set_camera_recording(camera_name, True, filename)
+            self._set_camera_recording_unlocked(camera_name, True, filename)
 
             self.logger.info(f"Started recording session: {recording_id}")
             return recording_id
@@ -262,11 +348,12 @@ class StateManager:
             recording.end_time = datetime.now()
             recording.file_size_bytes = file_size
             recording.frame_count = frame_count
+            self._finished_recordings.append((recording.end_time, recording_id))
 
             # Update camera state
-            self.set_camera_recording(recording.camera_name, False)
+            self._set_camera_recording_unlocked(recording.camera_name, False)
 
-            duration = (recording.end_time - recording.start_time).total_seconds()
+            duration = time.perf_counter() - recording.start_time_mono  # Unaffected by clock steps
             self.logger.info(f"Stopped recording session: {recording_id} (duration: {duration:.1f}s)")
             return True
 
@@ -280,27 +367,25 @@ class StateManager:
             recording.state = RecordingState.ERROR
             recording.error_message = error_message
             recording.end_time = datetime.now()
+            self._finished_recordings.append((recording.end_time, recording_id))
 
             # Update camera state
-            self.set_camera_recording(recording.camera_name, False)
+            self._set_camera_recording_unlocked(recording.camera_name, False)
 
             self.logger.error(f"Recording error for {recording_id}: {error_message}")
             return True
 
     def get_recording(self, recording_id: str) -> Optional[RecordingInfo]:
         """Get recording information"""
-        with self._lock:
-            return self._recordings.get(recording_id)
+        return self._recordings.get(recording_id)
 
-    def get_all_recordings(self) -> Dict[str, RecordingInfo]:
-        """Get all recording sessions"""
-        with self._lock:
-            return self._recordings.copy()
+    def get_all_recordings(self) -> Mapping[str, RecordingInfo]:
+        """Get all recording sessions (a read-only snapshot)"""
+        return self._recordings_view
 
     def get_active_recordings(self) -> Dict[str, RecordingInfo]:
         """Get currently active recordings"""
-        with self._lock:
-            return {rid: recording for rid, recording in self._recordings.items() if recording.state == RecordingState.RECORDING}
+        return {rid: recording for rid, recording in self._recordings.items() if recording.state == RecordingState.RECORDING}
 
     # System state management
     def set_mqtt_connected(self, connected: bool) -> None:
@@ -309,20 +394,19 @@ class StateManager:
             old_state = self._mqtt_connected
             self._mqtt_connected = connected
             if connected:
-                self._last_mqtt_message_time = datetime.now()
+                self._last_mqtt_message_ts = time.time()
 
             if old_state != connected:
                 self.logger.info(f"MQTT connection: {'connected' if connected else 'disconnected'}")
 
     def is_mqtt_connected(self) -> bool:
         """Check if MQTT is connected"""
-        with self._lock:
-            return self._mqtt_connected
+        return self._mqtt_connected
 
     def update_mqtt_activity(self) -> None:
         """Update last MQTT message time"""
         with self._lock:
-            self._last_mqtt_message_time = datetime.now()
+            self._last_mqtt_message_ts = time.time()
 
     def set_system_started(self, started: bool) -> None:
         """Set system started state"""
@@ -332,22 +416,22 @@ class StateManager:
 
     def is_system_started(self) -> bool:
         """Check if system is started"""
-        with self._lock:
-            return self._system_started
+        return self._system_started
 
     # Utility methods
     def get_system_summary(self) -> Dict[str, Any]:
         """Get a summary of the entire system state"""
-        with self._lock:
-            return {
-                "system_started": self._system_started,
-                "mqtt_connected": self._mqtt_connected,
-                "last_mqtt_message": self._last_mqtt_message_time.isoformat() if self._last_mqtt_message_time else None,
-                "machines": {name: {"state": machine.state.value, "last_updated": machine.last_updated.isoformat()} for name, machine in self._machines.items()},
-                "cameras": {name: {"status": camera.status.value, "is_recording": camera.is_recording, "last_checked": camera.last_checked.isoformat()} for name, camera in self._cameras.items()},
-                "active_recordings": len(self.get_active_recordings()),
-                "total_recordings": len(self._recordings),
-            }
+        last_mqtt_message_ts = self._last_mqtt_message_ts
+        recordings = self._recordings
+        return {
+            "system_started": self._system_started,
+            "mqtt_connected": self._mqtt_connected,
+            "last_mqtt_message": datetime.fromtimestamp(last_mqtt_message_ts).isoformat() if last_mqtt_message_ts else None,
+            "machines": {name: {"state": machine.state.value, "last_updated": machine.last_updated_iso} for name, machine in self._machines.items()},
+            "cameras": {name: {"status": camera.status.value, "is_recording": camera.is_recording, "last_checked": camera.last_checked_iso} for name, camera in self._cameras.items()},
+            "active_recordings": sum(1 for recording in recordings.values() if recording.state == RecordingState.RECORDING),
+            "total_recordings": len(recordings),
+        }
 
     def cleanup_old_recordings(self, max_age_hours: int = 24) -> int:
         """Clean up old recording entries from memory"""
@@ -355,14 +439,23 @@ class StateManager:
         removed_count = 0
 
         with self._lock:
-            to_remove = []
-            for recording_id, recording in self._recordings.items():
-                if recording.state != RecordingState.RECORDING and recording.end_time and recording.end_time < cutoff_time:
-                    to_remove.append(recording_id)
-
-            for recording_id in to_remove:
-                del self._recordings[recording_id]
-                removed_count += 1
+            # Recordings finish in end_time order, so expired ones are at the front of the queue
+            finished = self._finished_recordings
+            to_remove = set()
+            while finished and finished[0][0] < cutoff_time:
+                _, recording_id = finished.popleft()
+                recording = self._recordings.get(recording_id)
+                # The id may have been reused by a newer session since this entry was queued
+                if recording is not None and recording.state != RecordingState.RECORDING and recording.end_time and recording.end_time < cutoff_time:
+                    to_remove.add(recording_id)
+
+            if to_remove:
+                recordings = dict(self._recordings)
+                for recording_id in to_remove:
+                    del recordings[recording_id]
+                    removed_count += 1
+                self._recordings = recordings
+                self._recordings_view = MappingProxyType(recordings)
 
         if removed_count > 0:
             self.logger.info(f"Cleaned up {removed_count} old recording entries")
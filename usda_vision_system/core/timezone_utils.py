@@ -5,22 +5,58 @@ This module provides timezone-aware datetime handling for Atlanta, Georgia.
 """
 
 import datetime
-import pytz
+import functools
 import logging
-from typing import Optional
+import socket
+import struct
+import time
+from typing import Optional, Tuple
+from zoneinfo import ZoneInfo
+
+# NTP server used to check the system clock
+NTP_SERVER = "pool.ntp.org"
+
+# Seconds between the NTP epoch (1900) and the Unix epoch (1970)
+_NTP_EPOCH_OFFSET = 2208988800
+
+
+@functools.lru_cache(maxsize=8)
+def _format_second(timestamp: int, fmt: str, tz: Optional[datetime.tzinfo]) -> str:
+    """strftime for a whole Unix second; repeated calls within the same second hit the cache
+
+    tz=None means the system local timezone, formatted with time.strftime without building a datetime.
+    """
+    if tz is None:
+        return time.strftime(fmt, time.localtime(timestamp))
+    return datetime.datetime.fromtimestamp(timestamp, tz).strftime(fmt)
+
+
+def _is_system_timezone(tz: datetime.tzinfo) -> bool:
+    """Check whether the system local timezone has the same offsets and names as tz (winter and summer)"""
+    year = time.localtime().tm_year
+    for month in (1, 7):
+        timestamp = time.mktime((year, month, 1, 12, 0, 0, 0, 0, -1))
+        local = time.localtime(timestamp)
+        other = datetime.datetime.fromtimestamp(timestamp, tz)
+        if local.tm_gmtoff != other.utcoffset().total_seconds() or local.tm_zone != other.tzname():
+            return False
+    return True
 
 
 class TimezoneManager:
     """Manages timezone-aware datetime operations"""
     
-    def __init__(self, timezone_name: str = "America/New_York"):
+    def __init__(self, timezone_name: str = "America/New_York", verbose: bool = False):
         self.timezone_name = timezone_name
-        self.timezone = pytz.timezone(timezone_name)
+        self.timezone = ZoneInfo(timezone_name)
         self.logger = logging.getLogger(__name__)
+        # When the host runs in this timezone, "now" can be formatted straight from time.localtime()
+        self._local_tz: Optional[datetime.tzinfo] = None if _is_system_timezone(self.timezone) else self.timezone
         
         # Log timezone information
         self.logger.info(f"Timezone manager initialized for {timezone_name}")
-        self._log_timezone_info()
+        if verbose:
+            self._log_timezone_info()
     
     def _log_timezone_info(self) -> None:
         """Log current timezone information"""
@@ -35,51 +71,47 @@ class TimezoneManager:
     
     def utc_now(self) -> datetime.datetime:
         """Get current UTC time"""
-        return datetime.datetime.now(pytz.UTC)
+        return datetime.datetime.now(datetime.timezone.utc)
     
     def to_local(self, dt: datetime.datetime) -> datetime.datetime:
         """Convert datetime to local timezone"""
         if dt.tzinfo is None:
             # Assume UTC if no timezone info
-            dt = pytz.UTC.localize(dt)
+            dt = dt.replace(tzinfo=datetime.timezone.utc)
         return dt.astimezone(self.timezone)
     
     def to_utc(self, dt: datetime.datetime) -> datetime.datetime:
         """Convert datetime to UTC"""
         if dt.tzinfo is None:
             # Assume local timezone if no timezone info
-            dt = self.timezone.localize(dt)
-        return dt.astimezone(pytz.UTC)
+            dt = dt.replace(tzinfo=self.timezone)
+        return dt.astimezone(datetime.timezone.utc)
     
     def localize(self, dt: datetime.datetime) -> datetime.datetime:
         """Add timezone info to naive datetime (assumes local timezone)"""
         if dt.tzinfo is not None:
             return dt
-        return self.timezone.localize(dt)
+        return dt.replace(tzinfo=self.timezone)
     
     def format_timestamp(self, dt: Optional[datetime.datetime] = None, 
                         include_timezone: bool = True) -> str:
         """Format datetime as timestamp string"""
-        if dt is None:
-            dt = self.now()
-        
-        if dt.tzinfo is None:
-            dt = self.localize(dt)
-        
-        if include_timezone:
-            return dt.strftime("%Y-%m-%d %H:%M:%S %Z")
-        else:
-            return dt.strftime("%Y-%m-%d %H:%M:%S")
+        fmt = "%Y-%m-%d %H:%M:%S %Z" if include_timezone else "%Y-%m-%d %H:%M:%S"
+        return self._format(dt, fmt)
     
     def format_filename_timestamp(self, dt: Optional[datetime.datetime] = None) -> str:
         """Format datetime for use in filenames (no special characters)"""
+        return self._format(dt, "%Y%m%d_%H%M%S")
+    
+    def _format(self, dt: Optional[datetime.datetime], fmt: str) -> str:
+        """Format a datetime (default: now) to whole-second precision in its own timezone"""
         if dt is None:
-            dt = self.now()
+            return _format_second(int(time.time()), fmt, self._local_tz)
         
         if dt.tzinfo is None:
             dt = self.localize(dt)
         
-        return dt.strftime("%Y%m%d_%H%M%S")
+        return _format_second(int(dt.timestamp()), fmt, dt.tzinfo)
     
     def parse_timestamp(self, timestamp_str: str) -> datetime.datetime:
         """Parse timestamp string to datetime"""
@@ -130,72 +162,95 @@ class TimezoneManager:
         return dt.tzname()
 
 
-# Global timezone manager instance for Atlanta, Georgia
-atlanta_tz = TimezoneManager("America/New_York")
+# Global timezone manager instance for Atlanta, Georgia, created on first use
+_atlanta_tz: Optional[TimezoneManager] = None
+
+
+def _get_tz() -> TimezoneManager:
+    """Get the Atlanta timezone manager, creating it on first use"""
+    global _atlanta_tz
+    if _atlanta_tz is None:
+        _atlanta_tz = TimezoneManager("America/New_York")
+    return _atlanta_tz
+
+
+def __getattr__(name: str):
+    # Keep the module-level atlanta_tz name working without creating it at import time
+    if name == "atlanta_tz":
+        return _get_tz()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # Convenience functions
 def now_atlanta() -> datetime.datetime:
     """Get current Atlanta time"""
-    return atlanta_tz.now()
+    return _get_tz().now()
 
 
 def format_atlanta_timestamp(dt: Optional[datetime.datetime] = None) -> str:
     """Format timestamp in Atlanta timezone"""
-    return atlanta_tz.format_timestamp(dt)
+    return _get_tz().format_timestamp(dt)
 
 
 def format_filename_timestamp(dt: Optional[datetime.datetime] = None) -> str:
     """Format timestamp for filenames"""
-    return atlanta_tz.format_filename_timestamp(dt)
+    return _get_tz().format_filename_timestamp(dt)
 
 
 def to_atlanta_time(dt: datetime.datetime) -> datetime.datetime:
     """Convert any datetime to Atlanta time"""
-    return atlanta_tz.to_local(dt)
+    return _get_tz().to_local(dt)
+
+
+def _query_ntp(server: str = NTP_SERVER, timeout: float = 2.0) -> Tuple[float, float]:
+    """Query an NTP server with a single SNTP request; returns (clock offset seconds, server time)"""
+    # LI=0, VN=3, Mode=3 (client); the rest of the 48-byte request stays zero
+    request = b"\x1b" + 47 * b"\0"
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.settimeout(timeout)
+        sent = time.time()
+        sock.sendto(request, (server, 123))
+        response, _ = sock.recvfrom(48)
+        received = time.time()
+
+    if len(response) < 48:
+        raise ValueError(f"Short NTP response from {server}")
+
+    # Receive (T2) and transmit (T3) timestamps, as 32.32 fixed point seconds since 1900
+    rx_sec, rx_frac, tx_sec, tx_frac = struct.unpack("!4I", response[32:48])
+    server_rx = rx_sec - _NTP_EPOCH_OFFSET + rx_frac / 2**32
+    server_tx = tx_sec - _NTP_EPOCH_OFFSET + tx_frac / 2**32
+    offset = ((server_rx - sent) + (server_tx - received)) / 2
+    return offset, server_tx
 
 
 def check_time_sync() -> dict:
     """Check if system time appears to be synchronized"""
-    import requests
-    
+    tz = _get_tz()
     result = {
-        "system_time": now_atlanta(),
-        "timezone": atlanta_tz.get_timezone_name(),
-        "offset": atlanta_tz.get_timezone_offset(),
-        "dst": atlanta_tz.is_dst(),
+        "system_time": tz.now(),
+        "timezone": tz.get_timezone_name(),
+        "offset": tz.get_timezone_offset(),
+        "dst": tz.is_dst(),
         "sync_status": "unknown",
         "time_diff_seconds": None,
         "error": None
     }
     
     try:
-        # Check against world time API
-        response = requests.get(
-            "http://worldtimeapi.org/api/timezone/America/New_York", 
-            timeout=5
-        )
+        # Check against an NTP server (one UDP round trip)
+        offset, server_time = _query_ntp()
+        time_diff = abs(offset)
         
-        if response.status_code == 200:
-            data = response.json()
-            api_time = datetime.datetime.fromisoformat(data['datetime'])
-            
-            # Convert to same timezone for comparison
-            system_time = atlanta_tz.now()
-            time_diff = abs((system_time.replace(tzinfo=None) - 
-                           api_time.replace(tzinfo=None)).total_seconds())
-            
-            result["api_time"] = api_time
-            result["time_diff_seconds"] = time_diff
-            
-            if time_diff < 5:
-                result["sync_status"] = "synchronized"
-            elif time_diff < 30:
-                result["sync_status"] = "minor_drift"
-            else:
-                result["sync_status"] = "out_of_sync"
+        result["api_time"] = datetime.datetime.fromtimestamp(server_time, tz.timezone)
+        result["time_diff_seconds"] = time_diff
+        
+        if time_diff < 5:
+            result["sync_status"] = "synchronized"
+        elif time_diff < 30:
+            result["sync_status"] = "minor_drift"
         else:
-            result["error"] = f"API returned status {response.status_code}"
+            result["sync_status"] = "out_of_sync"
             
     except Exception as e:
         result["error"] = str(e)
@@ -5,9 +5,11 @@ This module coordinates all system components and provides graceful startup/shut
 """
 
 import signal
+import threading
 import time
 import logging
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 from datetime import datetime
 
@@ -16,11 +18,6 @@ from .core.state_manager import StateManager
 from .core.events import EventSystem, EventType
 from .core.logging_config import setup_logging, get_error_tracker, get_performance_logger
 from .core.timezone_utils import log_time_info, check_time_sync
-from .mqtt.client import MQTTClient
-from .camera.manager import CameraManager
-from .storage.manager import StorageManager
-from .recording.standalone_auto_recorder import StandaloneAutoRecorder
-from .api.server import APIServer
 
 
 class USDAVisionSystem:
@@ -42,7 +39,14 @@ class USDAVisionSystem:
         self.state_manager = StateManager()
         self.event_system = EventSystem()
 
-        # Initialize system components
+        # Initialize system components; these pull in paho, the camera SDK, OpenCV and FastAPI, so they
+        # are imported here rather than at module load (keeps `--help` and bad-argument exits fast)
+        from .storage.manager import StorageManager
+        from .mqtt.client import MQTTClient
+        from .camera.manager import CameraManager
+        from .recording.standalone_auto_recorder import StandaloneAutoRecorder
+        from .api.server import APIServer
+
         self.storage_manager = StorageManager(self.config, self.state_manager, self.event_system)
         self.mqtt_client = MQTTClient(self.config, self.state_manager, self.event_system)
         self.camera_manager = CameraManager(self.config, self.state_manager, self.event_system)
@@ -52,6 +56,9 @@ class USDAVisionSystem:
         # System state
         self.running = False
         self.start_time: Optional[datetime] = None
+        self._start_time_iso: Optional[str] = None
+        self._start_mono = 0.0
+        self._shutdown_event = threading.Event()
 
         # Setup signal handlers for graceful shutdown
         self._setup_signal_handlers()
@@ -75,8 +82,11 @@ class USDAVisionSystem:
             return True
 
         self.logger.info("Starting USDA Vision Camera System...")
+        self._shutdown_event.clear()
         self.performance_logger.start_timer("system_startup")
         self.start_time = datetime.now()
+        self._start_time_iso = self.start_time.isoformat()
+        self._start_mono = time.monotonic()
 
         # Check time synchronization
         self.logger.info("Checking time synchronization...")
@@ -88,41 +98,19 @@ class USDAVisionSystem:
             self.logger.info("✅ System time is synchronized")
 
         try:
-            # Start storage manager (no background tasks)
-            self.logger.info("Initializing storage manager...")
-            try:
-                # Verify storage integrity
-                integrity_report = self.storage_manager.verify_storage_integrity()
-                if integrity_report.get("fixed_issues", 0) > 0:
-                    self.logger.info(f"Fixed {integrity_report['fixed_issues']} storage integrity issues")
-                self.logger.info("Storage manager ready")
-            except Exception as e:
-                self.error_tracker.log_error(e, "storage_manager_init")
-                self.logger.error("Failed to initialize storage manager")
-                return False
-
-            # Start MQTT client
-            self.logger.info("Starting MQTT client...")
-            try:
-                if not self.mqtt_client.start():
-                    self.error_tracker.log_error(Exception("MQTT client failed to start"), "mqtt_startup")
-                    return False
-                self.logger.info("MQTT client started successfully")
-            except Exception as e:
-                self.error_tracker.log_error(e, "mqtt_startup")
-                return False
-
-            # Start camera manager
-            self.logger.info("Starting camera manager...")
-            try:
-                if not self.camera_manager.start():
-                    self.error_tracker.log_error(Exception("Camera manager failed to start"), "camera_startup")
+            # Storage verification, MQTT connection and camera setup are independent, so overlap them
+            with ThreadPoolExecutor(max_workers=3, thread_name_prefix="startup") as executor:
+                storage_future = executor.submit(self._start_storage_manager)
+                mqtt_future = executor.submit(self._start_mqtt_client)
+                camera_future = executor.submit(self._start_camera_manager)
+            storage_ok, mqtt_ok, camera_ok = storage_future.result(), mqtt_future.result(), camera_future.result()
+
+            if not (storage_ok and mqtt_ok and camera_ok):
+                # Roll back whichever components did come up
+                if camera_ok:
+                    self.camera_manager.stop()
+                if mqtt_ok:
                     self.mqtt_client.stop()
-                    return False
-                self.logger.info("Camera manager started successfully")
-            except Exception as e:
-                self.error_tracker.log_error(e, "camera_startup")
-                self.mqtt_client.stop()
                 return False
 
             # Start auto-recording manager
@@ -152,7 +140,7 @@ class USDAVisionSystem:
             self.state_manager.set_system_started(True)
 
             # Publish system started event
-            self.event_system.publish(EventType.SYSTEM_SHUTDOWN, "main_system", {"action": "started", "timestamp": self.start_time.isoformat()})  # We don't have SYSTEM_STARTED, using closest
+            self.event_system.publish(EventType.SYSTEM_SHUTDOWN, "main_system", {"action": "started", "timestamp": self._start_time_iso})  # We don't have SYSTEM_STARTED, using closest
 
             startup_time = self.performance_logger.end_timer("system_startup")
             self.logger.info(f"USDA Vision Camera System started successfully in {startup_time:.2f}s")
@@ -163,6 +151,46 @@ class USDAVisionSystem:
             self.stop()
             return False
 
+    def _start_storage_manager(self) -> bool:
+        """Verify storage integrity (the storage manager has no background tasks)"""
+        self.logger.info("Initializing storage manager...")
+        try:
+            integrity_report = self.storage_manager.verify_storage_integrity()
+            if integrity_report.get("fixed_issues", 0) > 0:
+                self.logger.info(f"Fixed {integrity_report['fixed_issues']} storage integrity issues")
+            self.logger.info("Storage manager ready")
+            return True
+        except Exception as e:
+            self.error_tracker.log_error(e, "storage_manager_init")
+            self.logger.error("Failed to initialize storage manager")
+            return False
+
+    def _start_mqtt_client(self) -> bool:
+        """Start the MQTT client"""
+        self.logger.info("Starting MQTT client...")
+        try:
+            if not self.mqtt_client.start():
+                self.error_tracker.log_error(Exception("MQTT client failed to start"), "mqtt_startup")
+                return False
+            self.logger.info("MQTT client started successfully")
+            return True
+        except Exception as e:
+            self.error_tracker.log_error(e, "mqtt_startup")
+            return False
+
+    def _start_camera_manager(self) -> bool:
+        """Start the camera manager"""
+        self.logger.info("Starting camera manager...")
+        try:
+            if not self.camera_manager.start():
+                self.error_tracker.log_error(Exception("Camera manager failed to start"), "camera_startup")
+                return False
+            self.logger.info("Camera manager started successfully")
+            return True
+        except Exception as e:
+            self.error_tracker.log_error(e, "camera_startup")
+            return False
+
     def stop(self) -> None:
         """Stop the entire system gracefully"""
         if not self.running:
@@ -170,6 +198,7 @@ class USDAVisionSystem:
 
         self.logger.info("Stopping USDA Vision Camera System...")
         self.running = False
+        self._shutdown_event.set()
 
         try:
             # Update system state
@@ -192,7 +221,7 @@ class USDAVisionSystem:
 
             # Final cleanup
             if self.start_time:
-                uptime = (datetime.now() - self.start_time).total_seconds()
+                uptime = time.monotonic() - self._start_mono
                 self.logger.info(f"System uptime: {uptime:.1f} seconds")
 
             self.logger.info("USDA Vision Camera System stopped")
@@ -209,12 +238,8 @@ class USDAVisionSystem:
         try:
             self.logger.info("System running... Press Ctrl+C to stop")
 
-            # Main loop - just keep the system alive
-            while self.running:
-                time.sleep(1)
-
-                # Periodic maintenance tasks could go here
-                # For example: cleanup old recordings, health checks, etc.
+            # Block until stop() is called (e.g. from the signal handler)
+            self._shutdown_event.wait()
 
         except KeyboardInterrupt:
             self.logger.info("Keyboard interrupt received")
@@ -227,8 +252,8 @@ class USDAVisionSystem:
         """Get comprehensive system status"""
         return {
             "running": self.running,
-            "start_time": self.start_time.isoformat() if self.start_time else None,
-            "uptime_seconds": (datetime.now() - self.start_time).total_seconds() if self.start_time else 0,
+            "start_time": self._start_time_iso,
+            "uptime_seconds": time.monotonic() - self._start_mono if self.start_time else 0,
             "components": {"mqtt_client": {"running": self.mqtt_client.is_running(), "connected": self.mqtt_client.is_connected()}, "camera_manager": {"running": self.camera_manager.is_running()}, "api_server": {"running": self.api_server.is_running()}},
             "state_summary": self.state_manager.get_system_summary(),
         }
@@ -30,17 +30,18 @@ class MQTTClient:
         self.client: Optional[mqtt.Client] = None
         self.connected = False
         self.running = False
-
-        # Threading
-        self._thread: Optional[threading.Thread] = None
-        self._stop_event = threading.Event()
+        self._connected_event = threading.Event()  # Set while connected to the broker
 
         # Message handler
         self.message_handler = MQTTMessageHandler(state_manager, event_system)
 
-        # Connection retry settings
-        self.reconnect_delay = 5  # seconds
-        self.max_reconnect_attempts = 10
+        # Bound methods used for every received message
+        self._update_activity = state_manager.update_mqtt_activity
+        self._submit_message = self.message_handler.submit_message
+
+        # Connection retry settings (paho backs off from the min to the max delay between attempts)
+        self.reconnect_min_delay = 1  # seconds
+        self.reconnect_max_delay = 60  # seconds
 
         # Topic mapping (topic -> machine_name)
         self.topic_to_machine = {topic: machine_name for machine_name, topic in self.mqtt_config.topics.items()}
@@ -51,23 +52,37 @@ class MQTTClient:
         self.error_count = 0
         self.last_message_time = None
 
+        # Status fields that never change after construction
+        self._static_status = {"broker_host": self.mqtt_config.broker_host, "broker_port": self.mqtt_config.broker_port, "subscribed_topics": list(self.mqtt_config.topics.values()), "topic_mappings": self.topic_to_machine}
+
     def start(self) -> bool:
-        """Start the MQTT client in a separate thread"""
+        """Start the MQTT client on paho's network thread"""
         if self.running:
             self.logger.warning("MQTT client is already running")
             return True
 
         self.logger.info("Starting MQTT client...")
         self.running = True
-        self._stop_event.clear()
         self.start_time = time.time()
+        self._connected_event.clear()
 
-        # Start in separate thread
-        self._thread = threading.Thread(target=self._run_loop, daemon=True)
-        self._thread.start()
+        try:
+            self.message_handler.start()
+            self.client = self._create_client()
 
-        # Wait a moment to see if connection succeeds
-        time.sleep(2)
+            # paho's network thread blocks on the socket, dispatches callbacks as messages arrive and
+            # reconnects on its own; topics are (re)subscribed from _on_connect
+            self.logger.info(f"Connecting to MQTT broker at {self.mqtt_config.broker_host}:{self.mqtt_config.broker_port}")
+            self.client.connect_async(self.mqtt_config.broker_host, self.mqtt_config.broker_port, 60)
+            self.client.loop_start()
+        except Exception as e:
+            self.logger.error(f"Failed to start MQTT client: {e}")
+            self.message_handler.stop()
+            self.running = False
+            return False
+
+        # Give the broker a moment to accept the connection, returning as soon as it does
+        self._connected_event.wait(timeout=2.0)
         return self.connected
 
     def stop(self) -> None:
@@ -77,77 +92,31 @@ class MQTTClient:
 
         self.logger.info("Stopping MQTT client...")
         self.running = False
-        self._stop_event.set()
 
-        if self.client and self.connected:
+        if self.client:
             self.client.disconnect()
+            self.client.loop_stop()
 
-        if self._thread and self._thread.is_alive():
-            self._thread.join(timeout=5)
+        # Process whatever the network thread queued before it stopped
+        self.message_handler.stop()
 
         self.logger.info("MQTT client stopped")
 
-    def _run_loop(self) -> None:
-        """Main MQTT client loop"""
-        reconnect_attempts = 0
-
-        while self.running and not self._stop_event.is_set():
-            try:
-                if not self.connected:
-                    if self._connect():
-                        reconnect_attempts = 0
-                    else:
-                        reconnect_attempts += 1
-                        if reconnect_attempts >= self.max_reconnect_attempts:
-                            self.logger.error(f"Max reconnection attempts ({self.max_reconnect_attempts}) reached")
-                            break
-
-                        self.logger.warning(f"Reconnection attempt {reconnect_attempts}/{self.max_reconnect_attempts} in {self.reconnect_delay}s")
-                        if self._stop_event.wait(self.reconnect_delay):
-                            break
-                        continue
-
-                # Process MQTT messages
-                if self.client:
-                    self.client.loop(timeout=1.0)
-
-                # Small delay to prevent busy waiting
-                if self._stop_event.wait(0.1):
-                    break
+    def _create_client(self) -> mqtt.Client:
+        """Create a paho client with callbacks, credentials and reconnect backoff configured"""
+        client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION1)
 
-            except Exception as e:
-                self.logger.error(f"Error in MQTT loop: {e}")
-                self.connected = False
-                if self._stop_event.wait(self.reconnect_delay):
-                    break
+        # Set callbacks
+        client.on_connect = self._on_connect
+        client.on_disconnect = self._on_disconnect
+        client.on_message = self._on_message
 
-        self.running = False
-        self.logger.info("MQTT client loop ended")
+        # Set authentication if provided
+        if self.mqtt_config.username and self.mqtt_config.password:
+            client.username_pw_set(self.mqtt_config.username, self.mqtt_config.password)
 
-    def _connect(self) -> bool:
-        """Connect to MQTT broker"""
-        try:
-            # Create new client instance
-            self.client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION1)
-
-            # Set callbacks
-            self.client.on_connect = self._on_connect
-            self.client.on_disconnect = self._on_disconnect
-            self.client.on_message = self._on_message
-
-            # Set authentication if provided
-            if self.mqtt_config.username and self.mqtt_config.password:
-                self.client.username_pw_set(self.mqtt_config.username, self.mqtt_config.password)
-
-            # Connect to broker
-            self.logger.info(f"Connecting to MQTT broker at {self.mqtt_config.broker_host}:{self.mqtt_config.broker_port}")
-            self.client.connect(self.mqtt_config.broker_host, self.mqtt_config.broker_port, 60)
-
-            return True
-
-        except Exception as e:
-            self.logger.error(f"Failed to connect to MQTT broker: {e}")
-            return False
+        client.reconnect_delay_set(min_delay=self.reconnect_min_delay, max_delay=self.reconnect_max_delay)
+        return client
 
     def _subscribe_to_topics(self) -> None:
         """Subscribe to all configured topics"""
@@ -170,6 +139,7 @@ class MQTTClient:
         """Callback for when the client connects to the broker"""
         if rc == 0:
             self.connected = True
+            self._connected_event.set()
             self.state_manager.set_mqtt_connected(True)
             self.event_system.publish(EventType.MQTT_CONNECTED, "mqtt_client")
             self.logger.info("🔗 MQTT CONNECTED to broker successfully")
@@ -185,6 +155,7 @@ class MQTTClient:
     def _on_disconnect(self, client, userdata, rc) -> None:
         """Callback for when the client disconnects from the broker"""
         self.connected = False
+        self._connected_event.clear()
         self.state_manager.set_mqtt_connected(False)
         self.event_system.publish(EventType.MQTT_DISCONNECTED, "mqtt_client")
 
@@ -199,27 +170,30 @@ class MQTTClient:
         """Callback for when a message is received"""
         try:
             topic = msg.topic
-            payload = msg.payload.decode("utf-8").strip()
-
-            self.logger.debug(f"MQTT message received - Topic: {topic}, Payload: {payload}")
 
             # Update MQTT activity and tracking
-            self.state_manager.update_mqtt_activity()
+            self._update_activity()
             self.message_count += 1
             self.last_message_time = time.time()
 
-            # Get machine name from topic
-            machine_name = self.topic_to_machine.get(topic)
-            if not machine_name:
+            # Get machine name from topic before touching the payload
+            try:
+                machine_name = self.topic_to_machine[topic]
+            except KeyError:
                 self.logger.warning(f"❓ MQTT UNKNOWN TOPIC: {topic}")
                 print(f"❓ MQTT UNKNOWN TOPIC: {topic}")
                 return
 
+            # The handler strips and normalizes the payload
+            payload = msg.payload.decode("utf-8")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("MQTT message received - Topic: %s, Payload: %s", topic, payload)
+
             # Show MQTT message on console
             print(f"📡 MQTT MESSAGE: {machine_name} → {payload}")
 
-            # Handle the message
-            self.message_handler.handle_message(machine_name, topic, payload)
+            # Hand the message to the handler's drain thread, which processes bursts in batches
+            self._submit_message(machine_name, topic, payload)
 
         except Exception as e:
             self.error_count += 1
@@ -256,7 +230,7 @@ class MQTTClient:
 
             last_message_time_str = datetime.fromtimestamp(self.last_message_time).isoformat()
 
-        return {"connected": self.connected, "running": self.running, "broker_host": self.mqtt_config.broker_host, "broker_port": self.mqtt_config.broker_port, "subscribed_topics": list(self.mqtt_config.topics.values()), "topic_mappings": self.topic_to_machine, "message_count": self.message_count, "error_count": self.error_count, "last_message_time": last_message_time_str, "uptime_seconds": uptime_seconds}
+        return {"connected": self.connected, "running": self.running, **self._static_status, "message_count": self.message_count, "error_count": self.error_count, "last_message_time": last_message_time_str, "uptime_seconds": uptime_seconds}
 
     def is_connected(self) -> bool:
         """Check if MQTT client is connected"""
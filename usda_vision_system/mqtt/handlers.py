@@ -5,12 +5,25 @@ This module handles processing of MQTT messages and triggering appropriate actio
 """
 
 import logging
-from typing import Dict, Optional
-from datetime import datetime
+import threading
+import time
+from collections import deque
+from types import MappingProxyType
+from typing import Deque, Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
 
 from ..core.state_manager import StateManager, MachineState
 from ..core.events import EventSystem, publish_machine_state_changed
 
+# Recognized payloads (lowercased) mapped to standard machine states
+_PAYLOAD_STATES = MappingProxyType(
+    {
+        **dict.fromkeys(("on", "true", "1", "start", "running", "active"), "on"),
+        **dict.fromkeys(("off", "false", "0", "stop", "stopped", "inactive"), "off"),
+        **dict.fromkeys(("error", "fault", "alarm"), "error"),
+    }
+)
+
 
 class MQTTMessageHandler:
     """Handles MQTT messages and triggers appropriate system actions"""
@@ -20,76 +33,161 @@ class MQTTMessageHandler:
         self.event_system = event_system
         self.logger = logging.getLogger(__name__)
 
+        # Bound methods used for every handled message
+        self._update_machine_state = state_manager.update_machine_state
+        self._update_machine_state_bulk = state_manager.update_machine_state_bulk
+        self._add_mqtt_events_bulk = state_manager.add_mqtt_events_bulk
+
+        # Messages queued by the MQTT network thread (single producer) for the drain thread (single consumer)
+        self._pending: Deque[Tuple[str, str, str]] = deque()
+        self._pending_event = threading.Event()
+        self._drain_thread: Optional[threading.Thread] = None
+        self._stop_requested = False
+
         # Message processing statistics
         self.message_count = 0
-        self.last_message_time: Optional[datetime] = None
         self.error_count = 0
 
+        # Messages are stamped with the monotonic clock; wall-clock time is derived from this anchor on demand
+        self._start_wall = datetime.now()
+        self._start_mono = time.monotonic()
+        self._last_message_mono: Optional[float] = None
+
+    @property
+    def last_message_time(self) -> Optional[datetime]:
+        """Wall-clock time of the last processed message"""
+        if self._last_message_mono is None:
+            return None
+        return self._start_wall + timedelta(seconds=self._last_message_mono - self._start_mono)
+
     def handle_message(self, machine_name: str, topic: str, payload: str) -> None:
         """Handle an incoming MQTT message"""
+        self.handle_messages([(machine_name, topic, payload)])
+
+    def start(self) -> None:
+        """Start the thread that processes queued messages in batches"""
+        if self._drain_thread and self._drain_thread.is_alive():
+            return
+
+        self._stop_requested = False
+        self._drain_thread = threading.Thread(target=self._drain_loop, name="mqtt-handler", daemon=True)
+        self._drain_thread.start()
+
+    def stop(self) -> None:
+        """Stop the drain thread once the messages already queued are processed"""
+        if not self._drain_thread:
+            return
+
+        self._stop_requested = True
+        self._pending_event.set()
+        self._drain_thread.join(timeout=5)
+        self._drain_thread = None
+
+    def submit_message(self, machine_name: str, topic: str, payload: str) -> None:
+        """Queue an incoming MQTT message for the drain thread"""
+        self._pending.append((machine_name, topic, payload))
+        self._pending_event.set()
+
+    def _drain_loop(self) -> None:
+        """Process queued messages in batches until stopped"""
+        pending = self._pending
+        while True:
+            self._pending_event.wait()
+            self._pending_event.clear()
+
+            # Everything queued so far goes in one batch; later arrivals set the event again
+            while pending:
+                self.handle_messages([pending.popleft() for _ in range(len(pending))])
+
+            if self._stop_requested:
+                return
+
+    def handle_messages(self, messages: List[Tuple[str, str, str]]) -> None:
+        """Handle a batch of (machine_name, topic, payload) messages; a failing message never affects the others"""
+        self.message_count += len(messages)
+        self._last_message_mono = time.monotonic()
+        debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
+
+        # Normalize payloads one by one, so a malformed message is counted and skipped on its own
+        accepted = []
+        for machine_name, topic, payload in messages:
+            try:
+                if debug_enabled:
+                    self.logger.debug("Processing MQTT message - Machine: %s, Topic: %s, Payload: %s", machine_name, topic, payload)
+                accepted.append((machine_name, topic, payload, self._normalize_payload(payload)))
+            except Exception as e:
+                self._message_failed(machine_name, e)
+        if not accepted:
+            return
+
+        # Update machine states under one lock acquisition, in arrival order
         try:
-            self.message_count += 1
-            self.last_message_time = datetime.now()
-
-            self.logger.info(f"Processing MQTT message - Machine: {machine_name}, Topic: {topic}, Payload: {payload}")
-
-            # Normalize payload
-            normalized_payload = self._normalize_payload(payload)
+            changes = self._update_machine_state_bulk([(machine_name, normalized, payload, topic) for machine_name, topic, payload, normalized in accepted])
+        except Exception as e:
+            # States are all resolved before any is applied, so nothing was updated; retry one at a time
+            self.logger.warning(f"Batch update of {len(accepted)} machine states failed ({e}), applying them one at a time")
+            changes = [self._update_single_state(*entry) for entry in accepted]
 
-            # Update machine state
-            state_changed = self.state_manager.update_machine_state(name=machine_name, state=normalized_payload, message=payload, topic=topic)
+        # Store the MQTT events in history
+        try:
+            self._add_mqtt_events_bulk([(machine_name, topic, payload, normalized) for machine_name, topic, payload, normalized in accepted])
+        except Exception as e:
+            self.logger.error(f"Error storing {len(accepted)} MQTT events in history: {e}")
 
-            # Store MQTT event in history
-            self.state_manager.add_mqtt_event(machine_name=machine_name, topic=topic, payload=payload, normalized_state=normalized_payload)
+        for (machine_name, topic, payload, normalized_payload), state_changed in zip(accepted, changes):
+            try:
+                # Publish state change event if state actually changed
+                if state_changed:
+                    publish_machine_state_changed(machine_name=machine_name, state=normalized_payload, source="mqtt_handler")
 
-            # Publish state change event if state actually changed
-            if state_changed:
-                publish_machine_state_changed(machine_name=machine_name, state=normalized_payload, source="mqtt_handler")
+                    self.logger.info(f"Machine {machine_name} state changed to: {normalized_payload}")
 
-                self.logger.info(f"Machine {machine_name} state changed to: {normalized_payload}")
+                # Log the message for debugging
+                if debug_enabled:
+                    self._log_message_details(machine_name, topic, payload, normalized_payload)
 
-            # Log the message for debugging
-            self._log_message_details(machine_name, topic, payload, normalized_payload)
+            except Exception as e:
+                self._message_failed(machine_name, e)
 
+    def _update_single_state(self, machine_name: str, topic: str, payload: str, normalized_payload: str) -> bool:
+        """Update one machine's state, counting a failure against that message only"""
+        try:
+            return self._update_machine_state(name=machine_name, state=normalized_payload, message=payload, topic=topic)
         except Exception as e:
-            self.error_count += 1
-            self.logger.error(f"Error handling MQTT message for {machine_name}: {e}")
+            self._message_failed(machine_name, e)
+            return False
+
+    def _message_failed(self, machine_name: str, error: Exception) -> None:
+        """Count and log a message that could not be handled"""
+        self.error_count += 1
+        self.logger.error(f"Error handling MQTT message for {machine_name}: {error}")
 
     def _normalize_payload(self, payload: str) -> str:
         """Normalize payload to standard machine states"""
         payload_lower = payload.lower().strip()
 
         # Map various possible payloads to standard states
-        if payload_lower in ["on", "true", "1", "start", "running", "active"]:
-            return "on"
-        elif payload_lower in ["off", "false", "0", "stop", "stopped", "inactive"]:
-            return "off"
-        elif payload_lower in ["error", "fault", "alarm"]:
-            return "error"
-        else:
+        state = _PAYLOAD_STATES.get(payload_lower)
+        if state is None:
             # For unknown payloads, log and return as-is
             self.logger.warning(f"Unknown payload format: '{payload}', treating as raw state")
             return payload_lower
+        return state
 
     def _log_message_details(self, machine_name: str, topic: str, original_payload: str, normalized_payload: str) -> None:
         """Log detailed message information"""
-        self.logger.debug(f"MQTT Message Details:")
-        self.logger.debug(f"  Machine: {machine_name}")
-        self.logger.debug(f"  Topic: {topic}")
-        self.logger.debug(f"  Original Payload: '{original_payload}'")
-        self.logger.debug(f"  Normalized Payload: '{normalized_payload}'")
-        self.logger.debug(f"  Timestamp: {self.last_message_time}")
-        self.logger.debug(f"  Total Messages Processed: {self.message_count}")
+        self.logger.debug("MQTT Message Details - Machine: %s, Topic: %s, Original Payload: %r, Normalized Payload: %r, Timestamp: %s, Total Messages Processed: %d", machine_name, topic, original_payload, normalized_payload, self.last_message_time, self.message_count)
 
     def get_statistics(self) -> Dict[str, any]:
         """Get message processing statistics"""
-        return {"total_messages": self.message_count, "error_count": self.error_count, "last_message_time": self.last_message_time.isoformat() if self.last_message_time else None, "success_rate": (self.message_count - self.error_count) / max(self.message_count, 1) * 100}
+        last_message_time = self.last_message_time
+        return {"total_messages": self.message_count, "error_count": self.error_count, "last_message_time": last_message_time.isoformat() if last_message_time else None, "success_rate": (self.message_count - self.error_count) / max(self.message_count, 1) * 100}
 
     def reset_statistics(self) -> None:
         """Reset message processing statistics"""
         self.message_count = 0
         self.error_count = 0
-        self.last_message_time = None
+        self._last_message_mono = None
         self.logger.info("MQTT message handler statistics reset")
 
 